@@ -0,0 +1,62 @@
+# examples/grid_visibility_benchmark.py
+#
+# Counts the QGridLayout passes (setGeometry calls) needed to show and hide every other row of a large
+# WSGridLayoutHandler, one row at a time with show_row()/hide_row() versus one set_rows_visible() call.
+
+from PySide6.QtWidgets import QApplication, QWidget, QGridLayout, QLabel, QLineEdit
+import time
+
+from WrapSideSix import WSGridLayoutHandler, WSGridRecord, WSGridPosition
+
+ROWS = 500
+
+
+class CountingGridLayout(QGridLayout):
+    passes = 0
+
+    def setGeometry(self, rect):
+        CountingGridLayout.passes += 1
+        super().setGeometry(rect)
+
+
+def build_grid():
+    grid = WSGridLayoutHandler()
+    # Swap in a layout that counts its passes
+    grid.layout = CountingGridLayout()
+    grid.container = QWidget()
+    grid.container.setLayout(grid.layout)
+    for row in range(ROWS):
+        grid.add_widget_record(WSGridRecord(QLabel(f"Setting {row}"), WSGridPosition(row, 0)))
+        grid.add_widget_record(WSGridRecord(QLineEdit(), WSGridPosition(row, 1)))
+    grid.align_widgets_top()
+    grid.as_widget().resize(400, 600)
+    grid.as_widget().show()
+    return grid
+
+
+def measure(app, label, toggle):
+    CountingGridLayout.passes = 0
+    start = time.perf_counter()
+    toggle()
+    app.processEvents()  # Let posted layout requests run, as the event loop would
+    print(f"{label:<28} {CountingGridLayout.passes:>5} layout passes, {time.perf_counter() - start:.3f}s")
+
+
+def run_benchmark(app):
+    grid = build_grid()
+    app.processEvents()
+    rows = range(0, ROWS, 2)
+
+    def one_by_one(visible):
+        for row in rows:
+            grid.show_row(row) if visible else grid.hide_row(row)
+
+    measure(app, "hide_row() per row", lambda: one_by_one(False))
+    measure(app, "show_row() per row", lambda: one_by_one(True))
+    measure(app, "set_rows_visible(hide)", lambda: grid.set_rows_visible({row: False for row in rows}))
+    measure(app, "set_rows_visible(show)", lambda: grid.set_rows_visible({row: True for row in rows}))
+
+
+if __name__ == "__main__":
+    app = QApplication([])
+    run_benchmark(app)
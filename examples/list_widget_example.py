@@ -1,7 +1,7 @@
 # examples/list_widget_example.py
 
 import sys
-from PySide6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget
+from PySide6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QLineEdit
 from WrapSideSix.widgets.list_widget import WSListSelectionWidget
 
 class MainWindow(QMainWindow):
@@ -24,6 +24,13 @@ class MainWindow(QMainWindow):
 
         # Create the WSListSelectionWidget
         self.list_widget = WSListSelectionWidget(multi_select=True, actions=actions)
+
+        # Type-ahead filter (debounced by the list widget)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter...")
+        self.filter_edit.textChanged.connect(self.list_widget.set_filter)
+
+        layout.addWidget(self.filter_edit)
         layout.addWidget(self.list_widget)
 
         # Connect signals
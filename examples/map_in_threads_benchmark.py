@@ -0,0 +1,56 @@
+# examples/map_in_threads_benchmark.py
+#
+# Processes 10,000 small items once with one run_in_thread call per item and once with map_in_threads.
+
+from PySide6.QtWidgets import QApplication, QWidget
+import time
+
+from WrapSideSix import run_in_thread, map_in_threads, get_thread_pool
+
+ITEMS = 10_000
+
+
+def process(item, progress_callback=None):
+    return sum(i * i for i in range(50)) + item
+
+
+def per_item(app, holder):
+    results = []
+
+    def on_finish(result):
+        results.append(result)
+        if len(results) == ITEMS:
+            app.quit()
+
+    for item in range(ITEMS):
+        run_in_thread(process, item, on_finish=on_finish, parent=holder)
+    app.exec()
+    get_thread_pool().waitForDone()  # The workers still emit `done` after the last result
+    return results
+
+
+def batched(app, chunksize):
+    results = []
+
+    def on_finish(result):
+        results.extend(result)
+        app.quit()
+
+    map_in_threads(process, range(ITEMS), chunksize=chunksize, on_finish=on_finish)
+    app.exec()
+    get_thread_pool().waitForDone()
+    return results
+
+
+if __name__ == "__main__":
+    app = QApplication([])
+    holder = QWidget()
+
+    start = time.perf_counter()
+    per_item(app, holder)
+    print(f"run_in_thread per item:       {time.perf_counter() - start:.2f}s")
+
+    for chunksize in (10, 100, 1000):
+        start = time.perf_counter()
+        batched(app, chunksize)
+        print(f"map_in_threads chunksize={chunksize:<5} {time.perf_counter() - start:.2f}s")
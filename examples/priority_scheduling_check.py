@@ -0,0 +1,57 @@
+# examples/priority_scheduling_check.py
+#
+# Floods a one-thread pool with LOW priority jobs, then submits one INTERACTIVE job and checks that it
+# starts before every LOW job that was still queued. Exits with an error if it does not.
+
+from PySide6.QtWidgets import QApplication, QWidget
+import sys
+import threading
+
+from WrapSideSix import run_in_thread, register_thread_pool, WSTaskPriority
+
+POOL = "priority_check"
+LOW_JOBS = 200
+
+
+def main():
+    app = QApplication([])
+    holder = QWidget()
+    register_thread_pool(POOL, max_threads=1)
+
+    started = []  # Job names in the order they started, recorded on the worker thread
+    lock = threading.Lock()
+    blocker_running = threading.Event()
+    release = threading.Event()
+    remaining = {'count': LOW_JOBS + 2}
+
+    def job(name, progress_callback=None):
+        with lock:
+            started.append(name)
+        if name == 'blocker':
+            blocker_running.set()
+            release.wait()
+
+    def on_finish(_):
+        remaining['count'] -= 1
+        if remaining['count'] == 0:
+            app.quit()
+
+    # Occupy the only thread so everything below has to wait in the queue
+    run_in_thread(job, 'blocker', on_finish=on_finish, parent=holder, pool=POOL)
+    blocker_running.wait()
+    for i in range(LOW_JOBS):
+        run_in_thread(job, f'low-{i}', on_finish=on_finish, parent=holder, pool=POOL, priority=WSTaskPriority.LOW)
+    run_in_thread(job, 'interactive', on_finish=on_finish, parent=holder, pool=POOL,
+                  priority=WSTaskPriority.INTERACTIVE)
+    release.set()
+    app.exec()
+
+    position = started.index('interactive')
+    print(f"INTERACTIVE job started at position {position} of {len(started)} (1 = right after the blocker)")
+    if position != 1:
+        sys.exit(f"FAIL: INTERACTIVE job started after {position - 1} queued LOW jobs")
+    print("OK: INTERACTIVE job overtook every queued LOW job")
+
+
+if __name__ == "__main__":
+    main()
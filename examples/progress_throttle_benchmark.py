@@ -0,0 +1,41 @@
+# examples/progress_throttle_benchmark.py
+#
+# Counts the progress events that reach the GUI thread for a task reporting progress on every iteration,
+# with and without run_in_thread's progress throttling.
+
+from PySide6.QtWidgets import QApplication, QWidget
+import time
+
+from WrapSideSix import run_in_thread, get_thread_pool
+
+ITERATIONS = 200_000
+
+
+def tight_loop(progress_callback=None):
+    for i in range(ITERATIONS):
+        progress_callback(i * 100 / (ITERATIONS - 1))
+    return ITERATIONS
+
+
+def run_benchmark(app, holder, progress_rate):
+    received = []
+    state = {}
+
+    def on_finish(_):
+        state['done'] = time.perf_counter()
+        app.quit()
+
+    start = time.perf_counter()
+    run_in_thread(tight_loop, on_progress=received.append, on_finish=on_finish, parent=holder,
+                  progress_rate=progress_rate)
+    app.exec()
+    get_thread_pool().waitForDone()  # The worker still emits `done` after on_finish has quit the loop
+    print(f"progress_rate={progress_rate!s:>4}: {len(received):>7} queued progress events, "
+          f"last value {received[-1]:.1f}, {state['done'] - start:.2f}s")
+
+
+if __name__ == "__main__":
+    app = QApplication([])
+    holder = QWidget()
+    run_benchmark(app, holder, None)
+    run_benchmark(app, holder, 30)
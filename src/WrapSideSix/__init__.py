@@ -12,7 +12,17 @@ logger.addHandler(logging.NullHandler())
 from .layouts.grid_layout import WSGridLayoutHandler, WSGridRecord, WSGridPosition
 from .dialogs.progress import WSProgressHandler  # WSProgressDialog,
 from .toolbars.toolbar_icon import WSToolbarIcon, DropdownItem
-from .tasks.thread_runner import run_in_thread
+from .tasks.thread_runner import run_in_thread, WSCancellationToken, WSTaskCancelled, WSTaskTimeout
+from .tasks.thread_pools import register_thread_pool, get_thread_pool, thread_pool_stats
+from .tasks.process_runner import run_in_process
+from .tasks.async_runner import run_in_thread_async, run_coroutine
+from .tasks.batching import map_in_threads
+from .tasks.task_registry import task_registry
+from .tasks.result_cache import result_cache
+from .tasks.metrics import task_metrics
+from .tasks.latest_only import latest_only, WSLatestOnlySubmitter
+from .tasks.task_graph import WSTaskGraph
+from .tasks.progress_events import WSProgressEvent, WSProgressReporter, WSRateEstimator
 from .widgets.line_edit_widget import WSLineButtonClear
 from .components.records_navigation_widget import NavWidget
-from .ws_core import WSSortOrder
+from .ws_core import WSSortOrder, WSSortKey, WSTaskPriority
@@ -1,50 +1,379 @@
 # progress.py
 
-from PySide6.QtWidgets import QProgressDialog, QProgressBar
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QProgressDialog, QProgressBar, QPushButton
+from PySide6.QtCore import Qt, QTimer, QObject, SIGNAL, SLOT
+from functools import partial
 
 import logging
+import time
+
+from ..tasks.progress_events import WSRateEstimator, format_amount
 
 # Logger Configuration
 logger = logging.getLogger(__name__)
 
 
+def _format_duration(seconds):
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def _update_event(state, event):
+    """Stores `event` on a handler or tracked task and feeds its stage rate estimator."""
+    previous = state.event
+    if previous is None or previous.stage != event.stage or previous.unit != event.unit:
+        state.event_rate.reset()
+    state.event_rate.update(event.done)
+    state.event = event
+    return event.percent
+
+
+class _TrackedTask:
+    def __init__(self, task, weight):
+        self.task = task
+        self.weight = weight
+        self.value = 0.0  # 0-100
+        self.done = False
+        self.event = None  # Newest WSProgressEvent
+        self.event_rate = WSRateEstimator()  # Units per second of the current stage
+
+
 class WSProgressHandler:
-    def __init__(self, parent, use_dialog=True, title="Working...", modal=True, indeterminate=False):
+    """
+    Progress dialog or bar for one or more background tasks.
+
+    Progress is either set directly with `set_value()` or collected from task handles passed to `track()`
+    (run_in_thread workers, map_in_threads tasks, ...), which are combined into one weighted value.
+    Repaints are capped at `max_fps`, and the label (dialog) or format (bar) shows the throughput and a
+    smoothed ETA estimate. Tasks reporting WSProgressEvents get their stage, amounts and unit rate shown,
+    e.g. "download: 1.2 GB of 4.0 GB · 80.0 MB/s · ETA 0:35".
+
+    In cancellable mode the dialog gets a Cancel button. Pressing it (or calling `cancel()`) cancels every
+    tracked task; queued workers leave the pool at once and running ones are told through their
+    cancellation token. The dialog shows "Cancelling…" until each task has acknowledged, then closes.
+
+    With `show_delay_ms`, the dialog is only shown when the work outlives that delay, or earlier when the
+    progress rate so far predicts it will. Fast tasks never create or paint it. The dialog widget is built
+    on first use and reused for every later show()/close() cycle of the handler.
+    """
+
+    # Progress needed before the rate is trusted to predict the duration of a deferred task
+    PREDICTION_MIN_SECONDS = 0.05
+
+    def __init__(self, parent, use_dialog=True, title="Working...", modal=True, indeterminate=False, max_fps=30,
+                 auto_close=False, cancellable=False, on_cancel=None, show_delay_ms=None):
+        """
+        Args:
+            parent: Parent widget
+            use_dialog: QProgressDialog if True, otherwise a QProgressBar
+            title: Window title and label of the dialog
+            modal: Window-modal dialog
+            indeterminate: Busy indicator without a value
+            max_fps: Maximum repaints per second
+            auto_close: Close once every tracked task has finished, failed or been cancelled
+            cancellable: Show a Cancel button (dialog only) that cancels the tracked tasks
+            on_cancel: Callback when cancellation is requested, e.g. to cancel work that is not tracked
+            show_delay_ms: Deferred show (dialog only): only show the dialog when the work is predicted to
+                take, or has taken, this long. None shows it immediately.
+        """
         self.use_dialog = use_dialog
-        self.progress = None
+        self.parent = parent
+        self.title = title
+        self.modal = modal
         self.indeterminate = indeterminate
+        self.auto_close = auto_close
+        self.cancellable = cancellable
+        self.on_cancel = on_cancel
+        self.cancelling = False
+        self._closing = False
+        self.show_delay_ms = show_delay_ms if use_dialog else None
+        self.value = 0.0
+        self.event = None
+        self.event_rate = WSRateEstimator()
+        self._rate = WSRateEstimator()  # Overall percent per second
+        self._progress = None
+        self._tasks = []
+        self._started_at = None
+        self._dirty = False
+        self._show_pending = False
+
+        # Coalesces updates into at most max_fps repaints
+        self._repaint_timer = QTimer()
+        self._repaint_timer.setSingleShot(True)
+        self._repaint_timer.setInterval(max(1, int(1000 / max_fps)))
+        self._repaint_timer.timeout.connect(self._repaint)
+
+        self._show_timer = QTimer()
+        self._show_timer.setSingleShot(True)
+        self._show_timer.timeout.connect(self._materialise)
+        if show_delay_ms is not None:
+            self._show_timer.setInterval(show_delay_ms)
+        else:
+            self._build()
 
-        if use_dialog:
+    @property
+    def progress(self):
+        """The QProgressDialog or QProgressBar, built on first access."""
+        if self._progress is None:
+            self._build()
+        return self._progress
+
+    def _build(self):
+        title = self.title
+        indeterminate = self.indeterminate
+        parent = self.parent
+        if self.use_dialog:
             min_val = 0
             max_val = 0 if indeterminate else 100
-            self.progress = QProgressDialog(title, "", min_val, max_val, parent)
-            self.progress.setWindowTitle(title)
-            self.progress.setMinimumDuration(0)
-            self.progress.setAutoClose(False)
-            self.progress.setAutoReset(False)
-            self.progress.setCancelButtonText("")
-            if modal:
-                self.progress.setWindowModality(Qt.WindowModality.WindowModal)
+            progress = QProgressDialog(title, "", min_val, max_val, parent)
+            progress.setWindowTitle(title)
+            progress.setMinimumDuration(0)
+            progress.setAutoClose(False)
+            progress.setAutoReset(False)
+            if self.cancellable:
+                progress.setCancelButtonText("Cancel")
+                # Replace the default close-on-cancel so the dialog stays up until the tasks have stopped
+                QObject.disconnect(progress, SIGNAL("canceled()"), progress, SLOT("cancel()"))
+                progress.canceled.connect(self._on_dialog_canceled)
+            else:
+                progress.setCancelButtonText("")
+            if self.modal:
+                progress.setWindowModality(Qt.WindowModality.WindowModal)
         else:
-            self.progress = QProgressBar(parent)
+            progress = QProgressBar(parent)
             if indeterminate:
-                self.progress.setRange(0, 0)
+                progress.setRange(0, 0)
             else:
-                self.progress.setRange(0, 100)
-                self.progress.setValue(0)
+                progress.setRange(0, 100)
+                progress.setValue(0)
+        self._progress = progress
 
     def show(self):
+        """Starts a run: shows the dialog now, or arms the deferred show."""
+        self._started_at = time.monotonic()
+        self._rate.reset()
+        if self.show_delay_ms is not None:
+            self._show_pending = True
+            self._show_timer.start()
+            return
+        self._show_widget()
+
+    def _show_widget(self):
         if isinstance(self.progress, QProgressDialog):
             if not self.indeterminate:
-                self.progress.setValue(0)
+                self.progress.setValue(int(self.overall_value()))
+            self.progress.setLabelText(self.title)
+            button = self.progress.findChild(QPushButton)
+            if button is not None:
+                button.setEnabled(True)
             self.progress.show()
 
+    def _materialise(self):
+        """Shows a deferred dialog once the work is known or predicted to outlast show_delay_ms."""
+        if not self._show_pending:
+            return
+        self._show_pending = False
+        self._show_timer.stop()
+        self._show_widget()
+        self._dirty = True
+        self._repaint()
+
+    def is_visible(self) -> bool:
+        return self._progress is not None and self._progress.isVisible()
+
     def set_value(self, value):
         # Only update if determinate
         if not self.indeterminate:
-            self.progress.setValue(int(value))
+            self.value = float(value)
+            self._schedule_repaint()
+
+    def set_event(self, event):
+        """Shows a WSProgressEvent, for progress that is not collected with track()."""
+        if _update_event(self, event) is not None:
+            self.set_value(event.percent)
+        else:
+            self._schedule_repaint()
 
     def close(self):
-        self.progress.close()
+        """Ends the run and hides the widget; the handler can be shown again for the next run."""
+        self._repaint_timer.stop()
+        self._show_timer.stop()
+        self._show_pending = False
+        self._tasks = []
+        self.value = 0.0
+        self.event = None
+        self.event_rate.reset()
+        self._rate.reset()
+        self._started_at = None
+        self.cancelling = False
+        if self._progress is not None:
+            # QProgressDialog.closeEvent emits canceled; closing is not a cancel request
+            self._closing = True
+            try:
+                self._progress.close()
+            finally:
+                self._closing = False
+
+    def _on_dialog_canceled(self):
+        # The Cancel button, Escape or the user closing the window
+        if not self._closing:
+            self.cancel()
+
+    def cancel(self):
+        """Cancels the tracked tasks and closes once they have all acknowledged."""
+        if self.cancelling:
+            return
+        self.cancelling = True
+        logger.info(f"Cancelling '{self.title}'")
+        if isinstance(self._progress, QProgressDialog):
+            self._progress.setLabelText(f"{self.title}\nCancelling…")
+            button = self._progress.findChild(QPushButton)
+            if button is not None:
+                button.setEnabled(False)
+        if self.on_cancel:
+            self.on_cancel()
+        for tracked in self._tasks:
+            if not tracked.done:
+                tracked.task.cancel()  # A queued worker acknowledges right away
+        if self.tasks_done() == len(self._tasks):
+            self._cancelled()
+
+    def _cancelled(self):
+        self.cancelling = False
+        self.close()
+
+    # Multiple tasks
+    def track(self, task, weight=1.0):
+        """
+        Adds a task to the combined progress.
+
+        Args:
+            task: Task handle whose `signals` has progress (0-100), finished, error and cancelled, and
+                optionally progress_events. A handle with `is_done()` that has already settled, e.g. a fast
+                task passed straight from run_in_thread, is counted as done on the next event-loop turn.
+            weight: Share of the overall progress, relative to the other tracked tasks (e.g. expected work)
+
+        Returns:
+            The task, for chaining
+        """
+        tracked = _TrackedTask(task, weight)
+        self._tasks.append(tracked)
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+        signals = task.signals
+        signals.progress.connect(partial(self._on_task_progress, tracked))
+        if hasattr(signals, 'progress_events'):
+            signals.progress_events.connect(partial(self._on_task_events, tracked))
+        for signal in (signals.finished, signals.error, signals.cancelled):
+            signal.connect(partial(self._on_task_done, tracked))
+        # A task that settled before the connections above were made never emits again
+        is_done = getattr(task, 'is_done', None)
+        if is_done is not None and is_done():
+            QTimer.singleShot(0, partial(self._on_task_done, tracked))
+        self._schedule_repaint()
+        return task
+
+    def tasks_done(self) -> int:
+        return sum(1 for tracked in self._tasks if tracked.done)
+
+    def overall_value(self) -> float:
+        """Weighted progress of the tracked tasks (0-100), or the value from set_value() when none are tracked."""
+        if not self._tasks:
+            return self.value
+        total_weight = sum(tracked.weight for tracked in self._tasks)
+        if total_weight <= 0:
+            return 0.0
+        return sum(tracked.weight * tracked.value for tracked in self._tasks) / total_weight
 
+    def eta(self):
+        """
+        Seconds left at the smoothed progress rate, falling back to the average rate since the start while
+        there are too few samples (None until there is progress).
+        """
+        eta = self._rate.eta(100.0)
+        if eta is not None:
+            return eta
+        value = self.overall_value()
+        if self._started_at is None or value <= 0:
+            return None
+        elapsed = time.monotonic() - self._started_at
+        return elapsed * (100.0 - value) / value
+
+    def _on_task_progress(self, tracked, value):
+        if not tracked.done and tracked in self._tasks:
+            tracked.value = min(100.0, max(0.0, float(value)))
+            self._schedule_repaint()
+
+    def _on_task_events(self, tracked, events):
+        if not tracked.done and tracked in self._tasks:
+            _update_event(tracked, events[-1])
+            self._schedule_repaint()
+
+    def _on_task_done(self, tracked, *_):
+        if tracked.done or tracked not in self._tasks:
+            return  # Already counted, or from a run that has been closed
+        tracked.done = True
+        tracked.value = 100.0
+        self._schedule_repaint()
+        if self.tasks_done() == len(self._tasks):
+            if self.cancelling:
+                self._cancelled()
+            elif self.auto_close:
+                self.close()
+
+    def _schedule_repaint(self):
+        self._dirty = True
+        if not self._repaint_timer.isActive():
+            self._repaint_timer.start()
+
+    def _predicts_long_run(self, value) -> bool:
+        if self._started_at is None or value <= 0:
+            return False
+        elapsed = time.monotonic() - self._started_at
+        if elapsed < self.PREDICTION_MIN_SECONDS:
+            return False
+        return elapsed * 100.0 / value * 1000 >= self.show_delay_ms
+
+    def _status_text(self, value):
+        parts = []
+        elapsed = time.monotonic() - self._started_at if self._started_at is not None else 0.0
+        source = self._tasks[0] if len(self._tasks) == 1 else self
+        event = source.event if len(self._tasks) <= 1 else None
+        if event is not None:
+            parts.append(event.describe())
+            rate = source.event_rate.rate
+            if rate:
+                parts.append(f"{format_amount(rate, event.unit)}/s")
+        elif len(self._tasks) > 1:
+            done = self.tasks_done()
+            parts.append(f"{done}/{len(self._tasks)} tasks")
+            if elapsed > 0 and done:
+                parts.append(f"{done / elapsed:.1f} tasks/s")
+        elif elapsed > 0 and value > 0:
+            parts.append(f"{value / elapsed:.1f} %/s")
+        eta = self.eta()
+        if eta is not None and value < 100:
+            parts.append(f"ETA {_format_duration(eta)}")
+        return " · ".join(parts)
+
+    def _repaint(self):
+        if not self._dirty or self.indeterminate or self.cancelling:
+            return
+        value = self.overall_value()
+        self._rate.update(value)
+        if self._show_pending:
+            if not self._predicts_long_run(value):
+                return  # Stays dirty; the show timer or a later update paints it
+            self._materialise()
+            return
+        if self._progress is None:
+            return
+        self._dirty = False
+        self.progress.setValue(int(value))
+        status = self._status_text(value)
+        if isinstance(self.progress, QProgressDialog):
+            self.progress.setLabelText(f"{self.title}\n{status}" if status else self.title)
+        else:
+            self.progress.setFormat(f"%p% · {status}" if status else "%p%")
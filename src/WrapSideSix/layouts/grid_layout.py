@@ -1,9 +1,10 @@
 # layouts/grid_layout.py
 
 from PySide6.QtWidgets import (QLayout, QWidget, QGroupBox,  QGridLayout,QSizePolicy)
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Optional, Iterable
+from typing import Optional, Iterable, Callable
 # from collections import namedtuple
 import warnings
 import logging
@@ -11,6 +12,9 @@ import logging
 # Logger Configuration
 logger = logging.getLogger(__name__)
 
+# QWidget's default maximum size (QWIDGETSIZE_MAX)
+QWIDGETSIZE_MAX = (1 << 24) - 1
+
 
 # # Define a named tuple type for grid positions
 # WSGridPosition = namedtuple('GridPosition', ['row', 'column'])
@@ -44,9 +48,13 @@ class WSGridRecord:
             Qt.AlignRight, Qt.AlignHCenter, Qt.AlignJustify, Qt.AlignTop, Qt.AlignBottom, Qt.AlignVCenter,
             Qt.AlignBaseline, Qt.AlignCenter, Qt.AlignAbsolute, Qt.AlignLeading, Qt.AlignTrailing)
             Combine with | (alignment = Qt.AlignRight | Qt.AlignBottom)
+        factory (Optional[Callable[[], QWidget]]): Builds the widget of a deferred record (widget=None) the
+            first time its row becomes visible. See WSGridRecord.deferred().
+        placeholder_height (Optional[int]): Height of the placeholder shown until a deferred record is built.
+            Defaults to the handler's placeholder_height.
 
     """
-    widget: QWidget
+    widget: Optional[QWidget]
     position: WSGridPosition
     row_stretch: Optional[int] = None
     col_stretch: Optional[int] = None
@@ -54,6 +62,32 @@ class WSGridRecord:
     col_span: Optional[int] = 1  # Default to 1, meaning no spanning
     row_span: Optional[int] = 1
     alignment: Optional[Qt.AlignmentFlag] = None
+    factory: Optional[Callable[[], QWidget]] = None
+    placeholder_height: Optional[int] = None
+
+    @classmethod
+    def deferred(cls, factory: Callable[[], QWidget], position: WSGridPosition, **options) -> 'WSGridRecord':
+        """A record whose widget is built by `factory` when its row first becomes visible."""
+        return cls(None, position, factory=factory, **options)
+
+    @property
+    def is_deferred(self) -> bool:
+        """True while the widget has not been built yet."""
+        return self.widget is None
+
+
+class _GridPlaceholder(QWidget):
+    """Stands in for a deferred record; being painted means its row has scrolled into view."""
+
+    def __init__(self, handler, row, height):
+        super().__init__()
+        self.handler = handler
+        self.row = row
+        self.setFixedHeight(height)
+        self.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Fixed)
+
+    def paintEvent(self, event):
+        self.handler._request_materialize(self.row)
 
 
 class WSGridLayoutHandler:
@@ -80,22 +114,104 @@ class WSGridLayoutHandler:
               expand evenly across the width unless explicitly configured not to.
           get_current_column_count(): Returns the current number of columns in the layout based on added widgets.
           get_current_row_count(): Returns the current number of rows in the layout based on added widgets.
+          remove_widget_record(record): Removes a record's widget from the layout.
+          set_rows_visible(rows) / set_columns_visible(columns): Shows and hides many rows or columns with a
+              single layout pass.
           get_layout_widget(): Returns the QWidget container managed by this layout manager.
+          materialize_row(row) / materialize_all(): Builds deferred records ahead of time.
+
+      Deferred records (WSGridRecord.deferred(factory, position)) are added as fixed-height placeholders
+      and built the first time their row is painted, e.g. when it is scrolled into view inside a
+      QScrollArea. Large forms then only pay for the rows the user actually sees.
       """
 
-    def __init__(self, spacing=0):
+    def __init__(self, spacing=0, placeholder_height=24):
         self.layout = QGridLayout()
         self.layout.setSpacing(spacing)
         self.container = QWidget()
         self.container.setLayout(self.layout)
         self.widget_records = []  # Track added widgets for layout adjustments
+        self._row_records = defaultdict(list)  # row -> records positioned in that row
+        self._column_records = defaultdict(list)  # column -> records positioned in that column
+        self._max_row = -1
+        self._max_column = -1
         self.explicit_col_stretches = {}  # Track columns with explicit stretch factors
+        self.placeholder_height = placeholder_height
+        self._placeholders = {}  # id(record) -> _GridPlaceholder of a deferred record
+        self._rows_to_materialize = set()
+        self.materialized_count = 0  # Deferred records built so far
         self.set_layout_margins(0, 0, 0, 0)
 
     def set_layout_margins(self, top, right, bottom, left):
         self.layout.setContentsMargins(left, top, right, bottom)
 
     def add_widget_record(self, record: WSGridRecord):
+        if record.widget is None:
+            if record.factory is None:
+                raise ValueError("A WSGridRecord needs a widget or a factory.")
+            # Deferred: a placeholder holds the cell until the row is painted
+            height = record.placeholder_height if record.placeholder_height is not None else self.placeholder_height
+            placeholder = _GridPlaceholder(self, record.position.row, height)
+            if record.min_width is not None:
+                placeholder.setMinimumWidth(record.min_width)
+            self._placeholders[id(record)] = placeholder
+            self._add_to_layout(record, placeholder)
+        else:
+            self._place_widget(record)
+
+        # Apply row stretch if specified
+        if record.row_stretch is not None:
+            self.set_row_stretch(record.position.row, record.row_stretch)
+
+        # Apply column stretch if specified
+        if record.col_stretch is not None:
+            self.set_column_stretch(record.position.column, record.col_stretch)
+
+        # Keep track of the added widget
+        self.widget_records.append(record)
+        row, column = record.position.row, record.position.column
+        self._row_records[row].append(record)
+        self._column_records[column].append(record)
+        self._max_row = max(self._max_row, row)
+        self._max_column = max(self._max_column, column)
+
+    def remove_widget_record(self, record: WSGridRecord):
+        """Removes the record's widget (or placeholder) from the layout; the widget is not deleted."""
+        widget = self._cell_widget(record)
+        self.layout.removeWidget(widget)
+        widget.setParent(None)
+        placeholder = self._placeholders.pop(id(record), None)
+        if placeholder is not None:
+            placeholder.deleteLater()
+
+        # In place, so references to the list stay valid. Matched by identity: list.remove() would call the
+        # dataclass __eq__ on every record before it
+        records = self.widget_records
+        del records[list(map(id, records)).index(id(record))]
+        row, column = record.position.row, record.position.column
+        self._unindex(self._row_records, row, record)
+        self._unindex(self._column_records, column, record)
+        # The running maxima only need a rescan of the index keys when their last record went away
+        if row == self._max_row and row not in self._row_records:
+            self._max_row = max(self._row_records, default=-1)
+        if column == self._max_column and column not in self._column_records:
+            self._max_column = max(self._column_records, default=-1)
+
+    @staticmethod
+    def _unindex(index, key, record):
+        records = [r for r in index.get(key, ()) if r is not record]
+        if records:
+            index[key] = records
+        else:
+            index.pop(key, None)
+
+    def records_in_row(self, row) -> list:
+        return list(self._row_records.get(row, ()))
+
+    def records_in_column(self, column) -> list:
+        return list(self._column_records.get(column, ()))
+
+    def _place_widget(self, record: WSGridRecord):
         # Ensure the object is a widget; if it's a layout, convert it to a widget
         if isinstance(record.widget, QLayout):
             # record.widget = layout_to_widget(record.widget)
@@ -105,24 +221,63 @@ class WSGridLayoutHandler:
         if record.min_width is not None:
             record.widget.setMinimumWidth(record.min_width)
 
+        self._add_to_layout(record, record.widget)
+
+    def _add_to_layout(self, record: WSGridRecord, widget: QWidget):
         # Add the widget to the layout with specified alignment, or default alignment if none is specified
         if record.alignment is not None:
-            self.layout.addWidget(record.widget, record.position.row, record.position.column, record.row_span,
+            self.layout.addWidget(widget, record.position.row, record.position.column, record.row_span,
                                   record.col_span, record.alignment)
         else:
-            self.layout.addWidget(record.widget, record.position.row, record.position.column, record.row_span,
+            self.layout.addWidget(widget, record.position.row, record.position.column, record.row_span,
                                   record.col_span)
 
-        # Apply row stretch if specified
-        if record.row_stretch is not None:
-            self.set_row_stretch(record.position.row, record.row_stretch)
-
-        # Apply column stretch if specified
-        if record.col_stretch is not None:
-            self.set_column_stretch(record.position.column, record.col_stretch)
-
-        # Keep track of the added widget
-        self.widget_records.append(record)
+    def _cell_widget(self, record: WSGridRecord) -> QWidget:
+        """The record's widget, or its placeholder while it is deferred."""
+        return record.widget if record.widget is not None else self._placeholders[id(record)]
+
+    # Deferred records
+    def _request_materialize(self, row):
+        # Called from a paint event; the layout is changed on the next event-loop turn instead
+        if not self._rows_to_materialize:
+            QTimer.singleShot(0, self._materialize_requested_rows)
+        self._rows_to_materialize.add(row)
+
+    def _materialize_requested_rows(self):
+        rows, self._rows_to_materialize = self._rows_to_materialize, set()
+        for row in sorted(rows):
+            self.materialize_row(row)
+
+    def materialize_row(self, row):
+        """Builds the deferred records of `row`."""
+        for record in list(self._row_records.get(row, ())):
+            if record.widget is None:
+                self._materialize(record)
+
+    def materialize_all(self):
+        """Builds every deferred record, e.g. before saving a form that reads all its widgets."""
+        for record in self.widget_records:
+            if record.widget is None:
+                self._materialize(record)
+
+    def deferred_count(self) -> int:
+        """Number of records whose widget has not been built yet."""
+        return len(self._placeholders)
+
+    def _materialize(self, record: WSGridRecord):
+        placeholder = self._placeholders.pop(id(record))
+        record.widget = record.factory()
+        self._place_widget(record)
+        # Carry over constraints set on the placeholder while the record was deferred
+        if placeholder.minimumWidth():
+            record.widget.setMinimumWidth(placeholder.minimumWidth())
+        if placeholder.maximumWidth() < QWIDGETSIZE_MAX:
+            record.widget.setMaximumWidth(placeholder.maximumWidth())
+        if placeholder.testAttribute(Qt.WidgetAttribute.WA_WState_ExplicitShowHide) and placeholder.isHidden():
+            record.widget.hide()  # Hidden with hide_row()/hide_column()
+        self.layout.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.materialized_count += 1
 
     def add_widget_records(self, records: Iterable[WSGridRecord]):
         for record in records:
@@ -136,14 +291,12 @@ class WSGridLayoutHandler:
         self.explicit_col_stretches[column] = stretch
 
     def set_column_minimum_width(self, column, min_width):
-        for record in self.widget_records:
-            if record.position.column == column:  # Check column index
-                record.widget.setMinimumWidth(min_width)
+        for record in self._column_records.get(column, ()):
+            self._cell_widget(record).setMinimumWidth(min_width)
 
     def set_column_maximum_width(self, column, max_width):
-        for record in self.widget_records:
-            if record.position.column == column:  # Check column index
-                record.widget.setMaximumWidth(max_width)
+        for record in self._column_records.get(column, ()):
+            self._cell_widget(record).setMaximumWidth(max_width)
 
     def create_vertical_spacer(self, height):
         spacer_widget = QWidget()
@@ -158,8 +311,8 @@ class WSGridLayoutHandler:
         return spacer_widget
 
     def align_widgets_top_left(self):
-        max_row = max(record.position.row for record in self.widget_records) + 1
-        max_col = max(record.position.column for record in self.widget_records) + 1
+        max_row = self._max_row + 1
+        max_col = self._max_column + 1
         # Set default column stretch for columns without an explicit stretch
         for col in range(max_col):
             if col not in self.explicit_col_stretches:
@@ -168,25 +321,25 @@ class WSGridLayoutHandler:
         # self.layout.setColumnStretch(max_col, 1)
 
     def align_widgets_top(self):
-        max_row = max(record.position.row for record in self.widget_records)
+        max_row = self._max_row
         # Stretch the last row to push all widgets to the top
         self.layout.setRowStretch(max_row + 1, 1)
 
         # Ensure columns expand evenly across the width
         # If you have columns that should not expand, set their stretch factor explicitly to 0
         # Otherwise, you can remove or modify the loop below based on your needs
-        max_col = max(record.position.column for record in self.widget_records) + 1
+        max_col = self._max_column + 1
         for col in range(max_col):
             if col not in self.explicit_col_stretches:
                 self.layout.setColumnStretch(col, 0)
 
     def get_current_column_count(self):
         # +1 because positions are 0-indexed
-        return max(record.position.column for record in self.widget_records) + 1
+        return self._max_column + 1
 
     def get_current_row_count(self):
         # +1 because positions are 0-indexed
-        return max(record.position.row for record in self.widget_records) + 1
+        return self._max_row + 1
 
     # def get_layout_widget(self):
     #     return self.container
@@ -228,14 +381,12 @@ class WSGridLayoutHandler:
         return groupbox
 
     def hide_row(self, row):
-        for record in self.widget_records:
-            if record.position.row == row:
-                record.widget.hide()
+        for record in self._row_records.get(row, ()):
+            self._cell_widget(record).hide()
 
     def show_row(self, row):
-        for record in self.widget_records:
-            if record.position.row == row:
-                record.widget.show()
+        for record in self._row_records.get(row, ()):
+            self._cell_widget(record).show()
 
     def toggle_row_visibility(self, row):
         is_hidden = self.is_row_hidden(row)
@@ -245,20 +396,18 @@ class WSGridLayoutHandler:
             self.hide_row(row)
 
     def is_row_hidden(self, row):
-        for record in self.widget_records:
-            if record.position.row == row:
-                return not record.widget.isVisible()
+        records = self._row_records.get(row)
+        if records:
+            return not self._cell_widget(records[0]).isVisible()
         return False
 
     def hide_column(self, column):
-        for record in self.widget_records:
-            if record.position.column == column:
-                record.widget.hide()
+        for record in self._column_records.get(column, ()):
+            self._cell_widget(record).hide()
 
     def show_column(self, column):
-        for record in self.widget_records:
-            if record.position.column == column:
-                record.widget.show()
+        for record in self._column_records.get(column, ()):
+            self._cell_widget(record).show()
 
     def toggle_column_visibility(self, column):
         is_hidden = self.is_column_hidden(column)
@@ -268,11 +417,43 @@ class WSGridLayoutHandler:
             self.hide_column(column)
 
     def is_column_hidden(self, column):
-        for record in self.widget_records:
-            if record.position.column == column:
-                return not record.widget.isVisible()
+        records = self._column_records.get(column)
+        if records:
+            return not self._cell_widget(records[0]).isVisible()
         return False
 
+    def set_rows_visible(self, rows: dict):
+        """
+        Shows or hides several rows at once, e.g. set_rows_visible({0: True, 3: False}).
+
+        Showing widgets one by one makes Qt lay out the grid again for every widget; here the layout and
+        repaints are suspended while the changes are applied, followed by a single layout pass.
+        """
+        self._set_cells_visible(self._row_records, rows)
+
+    def set_columns_visible(self, columns: dict):
+        """Shows or hides several columns at once, with a single layout pass; see set_rows_visible()."""
+        self._set_cells_visible(self._column_records, columns)
+
+    def _set_cells_visible(self, index, changes: dict):
+        parent = self.layout.parentWidget()
+        suspend_updates = parent is not None and parent.updatesEnabled()
+        if suspend_updates:
+            parent.setUpdatesEnabled(False)
+        self.layout.setEnabled(False)
+        try:
+            for key, visible in changes.items():
+                for record in index.get(key, ()):
+                    widget = self._cell_widget(record)
+                    if widget.isHidden() == visible:  # Skip cells already in the requested state
+                        widget.setVisible(visible)
+        finally:
+            self.layout.setEnabled(True)
+            self.layout.invalidate()
+            self.layout.activate()
+            if suspend_updates:
+                parent.setUpdatesEnabled(True)
+
     @classmethod
     def from_layout(cls, layout: QLayout) -> QWidget:
         """
@@ -0,0 +1,162 @@
+# WrapSideSix/tasks/async_runner.py
+
+import asyncio
+import logging
+import threading
+import traceback
+
+from .thread_runner import run_in_thread, _WorkerSignals, _move_to_app_thread, _connect_callbacks
+
+# Logger Configuration
+logger = logging.getLogger(__name__)
+
+_loop = None
+_loop_thread = None
+_lock = threading.Lock()
+_running = set()  # Keeps coroutine task handles alive until they finish
+
+
+async def run_in_thread_async(fn, *args, **kwargs):
+    """
+    Awaitable run_in_thread: runs `fn(*args, **kwargs)` on the thread pool and returns its result, or
+    raises its exception, in the awaiting coroutine.
+
+    Takes the same keyword arguments as run_in_thread (on_progress, pool, priority, parent, retries,
+    timeout, ...). The future is settled from the worker's outcome (finished, error or cancelled), so
+    retries, timeouts and cached results behave as they do for run_in_thread. This works whether the
+    asyncio loop runs on the GUI thread (e.g. through qasync) or on a thread of its own. Cancelling the
+    awaiting coroutine cancels the worker.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def _resolve(setter, value):
+        if not future.done():
+            setter(value)
+
+    def _cancel_future():
+        if not future.done():
+            future.cancel()
+
+    on_finish = kwargs.pop('on_finish', None)
+    on_error = kwargs.pop('on_error', None)
+    on_cancel = kwargs.pop('on_cancel', None)
+
+    def _on_finish(result):
+        loop.call_soon_threadsafe(_resolve, future.set_result, result)
+        if on_finish:
+            on_finish(result)
+
+    def _on_error(err):
+        loop.call_soon_threadsafe(_resolve, future.set_exception, err[0])
+        if on_error:
+            on_error(err)
+
+    def _on_cancel():
+        loop.call_soon_threadsafe(_cancel_future)
+        if on_cancel:
+            on_cancel()
+
+    worker = run_in_thread(fn, *args, on_finish=_on_finish, on_error=_on_error, on_cancel=_on_cancel,
+                           **kwargs)
+    try:
+        return await future
+    except asyncio.CancelledError:
+        worker.cancel()
+        raise
+
+
+def _get_loop():
+    global _loop, _loop_thread
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="WSAsyncioLoop", daemon=True)
+            _loop_thread.start()
+        return _loop
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Returns the background asyncio loop used by run_coroutine, starting it if needed."""
+    return _get_loop()
+
+
+def shutdown_event_loop(timeout=5.0):
+    """Stops the background asyncio loop. A later run_coroutine starts a new one."""
+    global _loop, _loop_thread
+    with _lock:
+        loop, thread = _loop, _loop_thread
+        _loop = _loop_thread = None
+    if loop is None:
+        return
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout)
+    if not thread.is_alive():
+        loop.close()
+
+
+class WSCoroutineTask:
+    """
+    Handle for a coroutine started with run_coroutine.
+
+    Attributes:
+        signals: started/finished/error/cancelled signals, delivered on the GUI thread.
+        future (concurrent.futures.Future): The future returned by asyncio.run_coroutine_threadsafe.
+    """
+
+    def __init__(self):
+        self.signals = _move_to_app_thread(_WorkerSignals())
+        self.future = None
+
+    def cancel(self) -> bool:
+        """Cancels the coroutine on the background loop."""
+        return self.future.cancel()
+
+    def is_cancelled(self) -> bool:
+        return self.future.cancelled()
+
+    def is_done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def _on_done(self, future):
+        _running.discard(self)
+        if future.cancelled():
+            self.signals.cancelled.emit()
+            return
+        exception = future.exception()
+        if exception is None:
+            self.signals.finished.emit(future.result())
+        else:
+            logger.error(f"Error in coroutine: {str(exception)}")
+            tb = ''.join(traceback.format_exception(exception))
+            self.signals.error.emit((exception, tb))
+
+
+def run_coroutine(coro, on_finish=None, on_error=None, on_start=None, on_cancel=None):
+    """
+    Runs `coro` on a shared background asyncio loop and delivers its outcome on the GUI thread.
+
+    Many concurrent I/O-bound requests can share this one loop thread instead of taking one pool thread
+    each.
+
+    Args:
+        coro: Coroutine object to run
+        on_finish: Callback with the coroutine's result
+        on_error: Callback for errors, receives (exception, traceback string)
+        on_start: Callback when the coroutine starts running on the loop
+        on_cancel: Callback when the coroutine is cancelled
+
+    Returns:
+        WSCoroutineTask: The task handle
+    """
+    task = WSCoroutineTask()
+    _connect_callbacks(task.signals, on_finish=on_finish, on_error=on_error, on_start=on_start, on_cancel=on_cancel)
+
+    async def _run():
+        task.signals.started.emit()
+        return await coro
+
+    _running.add(task)
+    task.future = asyncio.run_coroutine_threadsafe(_run(), _get_loop())
+    task.future.add_done_callback(task._on_done)
+    return task
@@ -0,0 +1,182 @@
+# WrapSideSix/tasks/batching.py
+
+from PySide6.QtCore import QObject, Signal
+from functools import reduce
+from itertools import islice
+import logging
+import threading
+
+from .thread_runner import run_in_thread, WSCancellationToken, _move_to_app_thread
+from .thread_pools import get_thread_pool
+from ..ws_core import WSTaskPriority
+
+# Logger Configuration
+logger = logging.getLogger(__name__)
+
+_running = set()  # Keeps map task handles alive until they finish
+
+
+class _MapSignals(QObject):
+    chunk_done = Signal(int, object)  # Emitted by the workers: (index of the chunk's first item, results)
+    partial = Signal(int, object)  # (index of the chunk's first item, results or reduced value)
+    progress = Signal(float)
+    finished = Signal(object)
+    error = Signal(tuple)  # (exception, traceback)
+    cancelled = Signal()
+
+
+class WSMapTask:
+    """
+    Handle for a map_in_threads job.
+
+    Attributes:
+        signals: partial/progress/finished/error/cancelled signals, delivered on the GUI thread.
+        total (Optional[int]): Number of items, if the iterable has a length.
+        processed (int): Number of items processed so far.
+    """
+
+    def __init__(self, fn, iterable, chunksize, reduce_fn, collect):
+        self.fn = fn
+        self.chunksize = chunksize
+        self.reduce_fn = reduce_fn
+        self.collect = collect
+        self.total = len(iterable) if hasattr(iterable, '__len__') else None
+        self.processed = 0
+        self.signals = _move_to_app_thread(_MapSignals())
+        self.cancel_token = WSCancellationToken()
+        self.workers = []
+
+        self._items = iter(iterable)
+        self._next_index = 0
+        self._items_lock = threading.Lock()
+        self._chunks = {}  # index of first item -> results or reduced value
+        self._active = 0
+        self._error = None
+
+        self.signals.chunk_done.connect(self._on_chunk_done)
+
+    def cancel(self):
+        """Stops handing out chunks; chunks already being processed are finished and discarded."""
+        self.cancel_token.cancel()
+        for worker in self.workers:
+            worker.cancel()
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_token.is_cancelled()
+
+    def _next_chunk(self):
+        with self._items_lock:
+            chunk = list(islice(self._items, self.chunksize))
+            start = self._next_index
+            self._next_index += len(chunk)
+        return start, chunk
+
+    def _work(self, progress_callback=None, cancel_token=None):
+        """Worker loop: keeps pulling chunks until the input is exhausted or the job is cancelled."""
+        fn = self.fn
+        reduce_fn = self.reduce_fn
+        while not self.cancel_token.is_cancelled():
+            start, chunk = self._next_chunk()
+            if not chunk:
+                return
+            results = [fn(item) for item in chunk]
+            if reduce_fn is not None:
+                results = reduce(reduce_fn, results)
+            self.signals.chunk_done.emit(start, (len(chunk), results))
+
+    def _on_chunk_done(self, start, payload):
+        count, results = payload
+        self.processed += count
+        if self.collect:
+            self._chunks[start] = results
+        self.signals.partial.emit(start, results)
+        self.signals.progress.emit(self.processed * 100 / self.total if self.total else float(self.processed))
+
+    def _on_worker_error(self, err):
+        if self._error is None:
+            self._error = err
+            self.cancel_token.cancel()  # Stop the other workers
+        self._on_worker_done()
+
+    def _on_worker_done(self, *_):
+        self._active -= 1
+        if self._active > 0:
+            return
+        _running.discard(self)
+        if self._error is not None:
+            self.signals.error.emit(self._error)
+        elif self.cancel_token.is_cancelled():
+            self.signals.cancelled.emit()
+        else:
+            self.signals.finished.emit(self._result())
+
+    def _result(self):
+        if not self.collect:
+            return None
+        ordered = [self._chunks[start] for start in sorted(self._chunks)]
+        if self.reduce_fn is not None:
+            return reduce(self.reduce_fn, ordered) if ordered else None
+        return [result for chunk in ordered for result in chunk]
+
+
+def map_in_threads(fn, iterable, chunksize=100, reduce_fn=None, workers=None, collect=True,
+                   on_partial=None, on_progress=None, on_finish=None, on_error=None, on_cancel=None,
+                   pool=None, priority=WSTaskPriority.NORMAL):
+    """
+    Applies `fn` to every item of `iterable` on a thread pool, processing the items in chunks.
+
+    A fixed set of workers (one pool task each) pulls chunks until the input runs out. This avoids
+    creating a worker, signals object and connections per item. Items are read from `iterable` lazily
+    under a lock, so generators work.
+
+    Args:
+        fn: Function called with each item
+        iterable: The items
+        chunksize: Items per chunk; each chunk produces one `partial` emission
+        reduce_fn: Optional associative two-argument function. Each chunk is reduced in its worker and
+            the chunk values are combined in input order, so on_finish receives a single value.
+        workers: Number of pool tasks to use; defaults to the pool's maximum thread count
+        collect: Keep results for on_finish. Set to False when consuming on_partial only.
+        on_partial: Callback (index of the chunk's first item, chunk results or reduced value), in
+            completion order
+        on_progress: Callback with the percentage done, or the processed item count when the iterable
+            has no length
+        on_finish: Callback with the results in input order (or the reduced value, or None if not
+            collecting)
+        on_error: Callback for the first error; remaining chunks are skipped
+        on_cancel: Callback when the job is cancelled
+        pool: Thread pool name, as for run_in_thread
+        priority: WSTaskPriority of the pool tasks
+
+    Returns:
+        WSMapTask: The job handle
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+
+    task = WSMapTask(fn, iterable, chunksize, reduce_fn, collect)
+
+    if on_partial:
+        task.signals.partial.connect(on_partial)
+    if on_progress:
+        task.signals.progress.connect(on_progress)
+    if on_finish:
+        task.signals.finished.connect(on_finish)
+    if on_error:
+        task.signals.error.connect(on_error)
+    if on_cancel:
+        task.signals.cancelled.connect(on_cancel)
+
+    if workers is None:
+        workers = get_thread_pool(pool).maxThreadCount()
+    if task.total is not None:
+        workers = min(workers, -(-task.total // chunksize))
+    workers = max(workers, 1)
+
+    _running.add(task)
+    task._active = workers
+    for _ in range(workers):
+        task.workers.append(run_in_thread(task._work, on_finish=task._on_worker_done, on_error=task._on_worker_error,
+                                          on_cancel=task._on_worker_done, pool=pool, priority=priority,
+                                          cancel_token=task.cancel_token))
+    return task
@@ -0,0 +1,126 @@
+# WrapSideSix/tasks/latest_only.py
+
+from PySide6.QtCore import QTimer
+from functools import partial
+import logging
+
+from .thread_runner import run_in_thread
+
+# Logger Configuration
+logger = logging.getLogger(__name__)
+
+
+class WSLatestOnlySubmitter:
+    """
+    Debounces submissions of one background function and delivers only the newest job's result.
+
+    Every `submit()` restarts a debounce timer; when it fires, the last submitted arguments are run with
+    run_in_thread. A newer job supersedes the previous one: a queued job is taken back from the pool, a
+    running one is told through its cancellation token, and its callbacks are never delivered.
+    Intended for search-as-you-type and similar workloads where only the last request matters.
+
+    Attributes:
+        submitted (int): Calls to submit().
+        started (int): Jobs actually handed to the thread pool.
+        superseded (int): Jobs cancelled because a newer one replaced them.
+        delivered (int): Results delivered to on_finish.
+    """
+
+    def __init__(self, fn, debounce_ms=150, on_finish=None, on_error=None, on_progress=None, on_start=None,
+                 on_cancel=None, parent=None, **run_options):
+        """
+        Args:
+            fn: Function run in the background; it may accept `cancel_token` to stop early when superseded
+            debounce_ms: Quiet period after the last submit() before the job starts (0 = next event-loop turn)
+            on_finish/on_error/on_progress/on_start: Callbacks, only ever called for the newest job
+            on_cancel: Called when the newest job is cancelled by other means than being superseded
+            parent: QObject that owns the debounce timer and the jobs
+            **run_options: Extra run_in_thread options (pool, priority, progress_rate, ...)
+        """
+        self.fn = fn
+        self.on_finish = on_finish
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_start = on_start
+        self.on_cancel = on_cancel
+        self.parent = parent
+        self.run_options = run_options
+
+        self.submitted = 0
+        self.started = 0
+        self.superseded = 0
+        self.delivered = 0
+
+        self._pending = None  # (args, kwargs) waiting for the debounce timer
+        self._worker = None
+        self._generation = 0
+        self._timer = QTimer(parent)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def debounce_ms(self):
+        return self._timer.interval()
+
+    @debounce_ms.setter
+    def debounce_ms(self, value):
+        self._timer.setInterval(value)
+
+    def submit(self, *args, **kwargs):
+        """Schedules `fn(*args, **kwargs)`, replacing any submission that has not started yet."""
+        self.submitted += 1
+        self._pending = (args, kwargs)
+        self._timer.start()
+
+    def flush(self):
+        """Starts the pending submission now, superseding the job in flight."""
+        self._timer.stop()
+        if self._pending is None:
+            return
+        args, kwargs = self._pending
+        self._pending = None
+        self._supersede()
+
+        generation = self._generation
+        self.started += 1
+        self._worker = run_in_thread(
+            self.fn, *args,
+            on_finish=partial(self._deliver, generation, 'finish'),
+            on_error=partial(self._deliver, generation, 'error'),
+            on_progress=partial(self._deliver, generation, 'progress'),
+            on_start=partial(self._deliver, generation, 'start'),
+            on_cancel=partial(self._deliver, generation, 'cancel'),
+            parent=self.parent, **self.run_options, **kwargs)
+
+    def cancel(self):
+        """Drops the pending submission and cancels the job in flight."""
+        self._timer.stop()
+        self._pending = None
+        self._supersede()
+
+    def is_busy(self) -> bool:
+        return self._pending is not None or self._worker is not None
+
+    def _supersede(self):
+        self._generation += 1
+        if self._worker is not None:
+            self._worker.cancel()
+            self.superseded += 1
+            self._worker = None
+
+    def _deliver(self, generation, kind, *args):
+        if generation != self._generation:
+            return  # From a superseded job
+        if kind in ('finish', 'error', 'cancel'):
+            self._worker = None
+        if kind == 'finish':
+            self.delivered += 1
+        callback = getattr(self, f"on_{kind}")
+        if callback:
+            callback(*args)
+
+
+def latest_only(fn, debounce_ms=150, **options) -> WSLatestOnlySubmitter:
+    """Shorthand for WSLatestOnlySubmitter(fn, debounce_ms, **options)."""
+    return WSLatestOnlySubmitter(fn, debounce_ms, **options)
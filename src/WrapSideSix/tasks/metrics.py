@@ -0,0 +1,168 @@
+# WrapSideSix/tasks/metrics.py
+
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Optional
+import logging
+import threading
+
+# Logger Configuration
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in seconds (the last bucket is open-ended)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def task_name(fn) -> str:
+    """Name under which a task function is aggregated, e.g. "package.module.Class.method"."""
+    fn = getattr(fn, 'func', fn)  # functools.partial
+    fn = getattr(fn, '__wrapped__', fn)
+    module = getattr(fn, '__module__', None)
+    qualname = getattr(fn, '__qualname__', None) or type(fn).__qualname__
+    return f"{module}.{qualname}" if module else qualname
+
+
+@dataclass
+class WSTaskRecord:
+    """
+    Timing of one background task. Timestamps are time.monotonic() values; `started_at` is None for a
+    task cancelled before it started.
+    """
+    task_id: Optional[int]
+    name: str
+    pool: str
+    enqueued_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    thread_name: Optional[str] = None
+    outcome: Optional[str] = None  # "finished", "error", "timeout" or "cancelled"
+    attempts: int = 0  # Calls of the task function, more than 1 when retried
+
+    @property
+    def wait_time(self) -> Optional[float]:
+        """Seconds spent queued in the pool."""
+        end = self.started_at if self.started_at is not None else self.finished_at
+        return None if end is None else end - self.enqueued_at
+
+    @property
+    def run_time(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+class WSHistogram:
+    """Fixed-bucket histogram of durations in seconds."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction (0-1) of the samples."""
+        if not self.count:
+            return None
+        threshold = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= threshold:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {'count': self.count, 'total': self.total, 'mean': self.mean, 'min': self.min, 'max': self.max,
+                'p50': self.percentile(0.5), 'p95': self.percentile(0.95),
+                'buckets': dict(zip(self.buckets + (float('inf'),), self.counts))}
+
+
+class _FunctionStats:
+    def __init__(self, buckets):
+        self.wait = WSHistogram(buckets)
+        self.run = WSHistogram(buckets)
+        self.outcomes = Counter()
+        self.threads = Counter()
+
+
+class WSTaskMetrics:
+    """
+    Collects WSTaskRecords from run_in_thread workers and aggregates them per function name.
+
+    Hooks are called with each finished record on the worker thread, so they should be cheap and
+    thread-safe (e.g. forward to a metrics client or append to a queue).
+
+    Attributes:
+        enabled (bool): Set to False to stop collecting; hooks are not called either.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.enabled = True
+        self.buckets = buckets
+        self._stats = {}
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Callable[[WSTaskRecord], None]):
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[WSTaskRecord], None]):
+        if hook in self._hooks:
+            self._hooks.remove(hook)
+
+    def record(self, record: WSTaskRecord):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stats.get(record.name)
+            if stats is None:
+                stats = self._stats[record.name] = _FunctionStats(self.buckets)
+            wait_time = record.wait_time
+            if wait_time is not None:
+                stats.wait.add(wait_time)
+            run_time = record.run_time
+            if run_time is not None:
+                stats.run.add(run_time)
+            stats.outcomes[record.outcome] += 1
+            if record.thread_name is not None:
+                stats.threads[record.thread_name] += 1
+        for hook in list(self._hooks):
+            try:
+                hook(record)
+            except Exception as e:
+                logger.error(f"Error in task metrics hook: {str(e)}")
+
+    def snapshot(self) -> dict:
+        """{function name: {'wait': histogram dict, 'run': histogram dict, 'outcomes': {...}, 'threads': {...}}}"""
+        with self._lock:
+            return {name: {'wait': stats.wait.as_dict(), 'run': stats.run.as_dict(),
+                           'outcomes': dict(stats.outcomes), 'threads': dict(stats.threads)}
+                    for name, stats in self._stats.items()}
+
+    def busiest(self, count=10) -> list[tuple[str, float]]:
+        """The functions with the most total run time, as (name, seconds), to find what saturates a pool."""
+        with self._lock:
+            totals = [(name, stats.run.total) for name, stats in self._stats.items()]
+        return sorted(totals, key=lambda item: item[1], reverse=True)[:count]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+task_metrics = WSTaskMetrics()
@@ -0,0 +1,225 @@
+# WrapSideSix/tasks/process_runner.py
+
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+from functools import partial
+import itertools
+import logging
+import multiprocessing
+import pickle
+import threading
+import traceback
+
+from .thread_runner import (_WorkerSignals, _Worker, _ProgressChannel, _accepts_kwarg, _move_to_app_thread,
+                            _connect_callbacks)
+
+# Logger Configuration
+logger = logging.getLogger(__name__)
+
+# Parent process state
+_executor = None
+_max_workers = None
+_events = None  # Queue of (task_id, kind, payload) messages from the child processes
+_relay_thread = None
+_tasks = {}  # task_id -> WSProcessTask, until the task reports its outcome
+_task_ids = itertools.count(1)
+_lock = threading.Lock()
+
+# Child process state
+_child_events = None
+
+
+def _init_child(events):
+    global _child_events
+    _child_events = events
+
+
+def _post(task_id, kind, payload=None):
+    _child_events.put((task_id, kind, payload))
+
+
+def _child_entry(task_id, fn, args, kwargs, progress_rate):
+    """Runs in the child process; every outcome goes through the event queue so it stays ordered."""
+    _post(task_id, 'started')
+    channel = None
+    if 'progress_callback' not in kwargs and _accepts_kwarg(fn, 'progress_callback'):
+        channel = _ProgressChannel(partial(_post, task_id, 'progress'), partial(_post, task_id, 'progress_events'),
+                                   progress_rate)
+        kwargs['progress_callback'] = channel
+    try:
+        result = fn(*args, **kwargs)
+        if channel is not None:
+            channel.flush()
+        _post(task_id, 'finished', pickle.dumps(result))
+    except Exception as e:
+        if channel is not None:
+            channel.flush()
+        tb = traceback.format_exc()
+        try:
+            payload = pickle.dumps((e, tb))
+        except Exception:
+            # Not every exception can cross the process boundary
+            payload = pickle.dumps((RuntimeError(f"{type(e).__name__}: {e}"), tb))
+        _post(task_id, 'error', payload)
+
+
+def _relay():
+    """Parent-side thread that turns child events into signals, delivered on the GUI thread."""
+    while True:
+        message = _events.get()
+        if message is None:
+            return
+        task_id, kind, payload = message
+        task = _tasks.get(task_id)
+        if task is None:
+            continue
+        try:
+            if kind == 'progress':
+                task.signals.progress.emit(payload)
+            elif kind == 'progress_events':
+                task.signals.progress_events.emit(payload)
+            elif kind == 'started':
+                task.signals.started.emit()
+            elif kind == 'finished':
+                task._complete('finished', pickle.loads(payload))
+            elif kind == 'error':
+                task._complete('error', pickle.loads(payload))
+        except Exception as e:
+            logger.error(f"Error relaying process task event: {str(e)}")
+            task._complete('error', (e, traceback.format_exc()))
+
+
+def configure_process_pool(max_workers=None):
+    """
+    Sets the number of worker processes used by run_in_process (defaults to the CPU count).
+    Takes effect for a pool that has not been started yet, or after shutdown_process_pool().
+    """
+    global _max_workers
+    _max_workers = max_workers
+
+
+def _get_executor():
+    global _executor, _events, _relay_thread
+    with _lock:
+        if _executor is None:
+            # spawn avoids forking a process that has Qt threads running
+            context = multiprocessing.get_context('spawn')
+            _events = context.Queue()
+            _executor = ProcessPoolExecutor(max_workers=_max_workers, mp_context=context,
+                                            initializer=_init_child, initargs=(_events,))
+            _relay_thread = threading.Thread(target=_relay, name="WSProcessRelay", daemon=True)
+            _relay_thread.start()
+        return _executor
+
+
+def shutdown_process_pool(wait=True):
+    """Stops the worker processes and the relay thread. A later run_in_process starts a new pool."""
+    global _executor, _events, _relay_thread
+    with _lock:
+        executor, events, relay_thread = _executor, _events, _relay_thread
+        _executor = _events = _relay_thread = None
+    if executor is None:
+        return
+    executor.shutdown(wait=wait, cancel_futures=True)
+    events.put(None)
+    if wait:
+        relay_thread.join()
+
+
+class WSProcessTask:
+    """
+    Handle for a task started with run_in_process.
+
+    Attributes:
+        task_id (int): Identifier of the task.
+        signals: The same started/progress/finished/error/cancelled signals as a run_in_thread worker.
+        future (concurrent.futures.Future): The executor future.
+    """
+
+    def __init__(self, task_id):
+        self.task_id = task_id
+        self.signals = _move_to_app_thread(_WorkerSignals())
+        self.future = None
+        self.done = False
+        self.cancel_requested = False
+
+    def cancel(self) -> bool:
+        """
+        Cancels the task. A task that has not started is removed from the executor queue; a running task
+        cannot be interrupted, but its result is discarded and `cancelled` is emitted when it ends.
+
+        Returns:
+            bool: True if the task was removed before it started.
+        """
+        self.cancel_requested = True
+        if self.future is not None and self.future.cancel():
+            self._complete('cancelled')
+            return True
+        return False
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_requested
+
+    def is_done(self) -> bool:
+        return self.done
+
+    def _complete(self, kind, payload=None):
+        with _lock:
+            if self.done:
+                return
+            self.done = True
+            _tasks.pop(self.task_id, None)
+        if kind == 'cancelled' or self.cancel_requested:
+            self.signals.cancelled.emit()
+        elif kind == 'finished':
+            self.signals.finished.emit(payload)
+        else:
+            self.signals.error.emit(payload)
+
+    def _on_future_done(self, future):
+        # Normal outcomes arrive through the event queue; this only catches failures of the pool itself
+        # (e.g. a crashed child process or an argument that could not be pickled)
+        try:
+            exception = future.exception()
+        except CancelledError:
+            self._complete('cancelled')
+            return
+        if exception is not None:
+            logger.error(f"Error in worker process: {str(exception)}")
+            tb = ''.join(traceback.format_exception(exception))
+            self._complete('error', (exception, tb))
+
+
+def run_in_process(fn, *args, on_finish=None, on_error=None, on_progress=None, on_start=None, on_cancel=None,
+                   on_progress_events=None, progress_rate=_Worker.DEFAULT_PROGRESS_RATE, **kwargs):
+    """
+    Runs `fn(*args, **kwargs)` in a worker process using a concurrent.futures.ProcessPoolExecutor.
+
+    Use this instead of run_in_thread for pure-Python CPU-bound work, which the GIL would otherwise
+    serialize. `fn`, its arguments and its result must be picklable, so `fn` has to be a module-level
+    function. If `fn` accepts `progress_callback`, progress is sent back through a queue (throttled
+    like run_in_thread). All callbacks run on the GUI thread.
+
+    Args:
+        fn: Picklable function to execute
+        *args: Arguments to pass to the function
+        on_finish: Callback for successful completion
+        on_error: Callback for errors, receives (exception, traceback string)
+        on_progress: Callback for progress updates
+        on_start: Callback when a worker process begins execution
+        on_cancel: Callback when the task is cancelled
+        on_progress_events: Callback with batches of WSProgressEvent, as for run_in_thread
+        progress_rate: Maximum progress updates per second; None or 0 sends every update
+        **kwargs: Keyword arguments to pass to the function
+
+    Returns:
+        WSProcessTask: The task handle
+    """
+    task = WSProcessTask(next(_task_ids))
+    _connect_callbacks(task.signals, on_finish, on_error, on_progress, on_start, on_cancel, on_progress_events)
+
+    executor = _get_executor()
+    with _lock:
+        _tasks[task.task_id] = task
+    task.future = executor.submit(_child_entry, task.task_id, fn, args, kwargs, progress_rate)
+    task.future.add_done_callback(task._on_future_done)
+    return task
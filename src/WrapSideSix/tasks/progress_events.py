@@ -0,0 +1,172 @@
+# WrapSideSix/tasks/progress_events.py
+
+from dataclasses import dataclass
+from typing import Optional
+import logging
+import time
+
+# Logger Configuration
+logger = logging.getLogger(__name__)
+
+_DECIMAL_PREFIXES = ('', 'k', 'M', 'G', 'T', 'P')
+_SCALED_UNITS = ('B', 'b', 'bit')  # Units shown with decimal prefixes, e.g. "1.2 GB"
+
+
+def format_amount(value, unit='') -> str:
+    """Formats an amount with its unit: "1.2 GB" for bytes, "1,234 rows" otherwise."""
+    if unit in _SCALED_UNITS:
+        index = 0
+        while abs(value) >= 1000 and index < len(_DECIMAL_PREFIXES) - 1:
+            value /= 1000.0
+            index += 1
+        if index == 0:
+            return f"{value:.0f} {unit}"
+        return f"{value:.1f} {_DECIMAL_PREFIXES[index]}{unit}"
+    text = f"{value:,.0f}" if float(value).is_integer() else f"{value:,.1f}"
+    return f"{text} {unit}" if unit else text
+
+
+@dataclass(frozen=True)
+class WSProgressEvent:
+    """
+    Structured progress report from a background task.
+
+    Pass it to the `progress_callback` a task receives from run_in_thread, or use a WSProgressReporter.
+
+    Attributes:
+        done: Work done so far, in `unit`
+        total: Total work in `unit`, if known
+        unit: e.g. "B", "rows", "files"
+        stage: Name of the current stage; nested stages are joined with "/", e.g. "import/parse"
+        message: Free text for the user
+        overall: Fraction (0-1) of the whole task, including the stages around this one
+    """
+    done: float
+    total: Optional[float] = None
+    unit: str = ''
+    stage: Optional[str] = None
+    message: Optional[str] = None
+    overall: Optional[float] = None
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Fraction (0-1) of the current stage, or None without a total."""
+        if not self.total:
+            return None
+        return min(1.0, max(0.0, self.done / self.total))
+
+    @property
+    def percent(self) -> Optional[float]:
+        """Overall progress in percent, falling back to the stage fraction."""
+        fraction = self.overall if self.overall is not None else self.fraction
+        return None if fraction is None else fraction * 100.0
+
+    def describe(self) -> str:
+        """e.g. "download: 1.2 GB of 4.0 GB"."""
+        amount = format_amount(self.done, self.unit)
+        if self.total is not None:
+            amount = f"{amount} of {format_amount(self.total, self.unit)}"
+        text = f"{self.stage}: {amount}" if self.stage else amount
+        return f"{text} – {self.message}" if self.message else text
+
+
+class WSProgressReporter:
+    """
+    Builds WSProgressEvents for a task and its nested stages.
+
+    The root reporter covers the whole task. `sub()` hands out consecutive slices of it, so each stage can
+    report its own done/total while `overall` stays correct for the task as a whole.
+
+    Example:
+        def import_file(path, progress_callback=None):
+            progress = WSProgressReporter(progress_callback)
+            download = progress.sub("download", 0.7)
+            ...
+            download.update(received, size, unit="B")
+            parse = progress.sub("parse", 0.3)
+            parse.update(rows_done, rows, unit="rows")
+    """
+
+    def __init__(self, callback, stage=None, offset=0.0, span=1.0):
+        """
+        Args:
+            callback: Receives each WSProgressEvent, usually the task's progress_callback
+            stage: Stage name of this reporter
+            offset: Start of this reporter's slice of the whole task (0-1)
+            span: Size of the slice (0-1)
+        """
+        self.callback = callback
+        self.stage = stage
+        self.offset = offset
+        self.span = span
+        self._next_offset = offset
+
+    def update(self, done, total=None, unit='', message=None):
+        overall = None
+        if total:
+            overall = self.offset + self.span * min(1.0, max(0.0, done / total))
+        if self.callback is not None:
+            self.callback(WSProgressEvent(done, total, unit, self.stage, message, overall))
+
+    def sub(self, stage, weight) -> 'WSProgressReporter':
+        """
+        Returns a reporter for the next `weight` (0-1) of this reporter's slice.
+
+        Args:
+            stage: Name of the sub-stage
+            weight: Share of this reporter's work done by the sub-stage
+        """
+        span = self.span * weight
+        offset = self._next_offset
+        self._next_offset = min(self.offset + self.span, offset + span)
+        name = f"{self.stage}/{stage}" if self.stage else stage
+        return WSProgressReporter(self.callback, name, offset, span)
+
+
+class WSRateEstimator:
+    """
+    Exponentially smoothed rate of progress and the resulting ETA.
+
+    Samples closer together than `min_interval` are accumulated first, so bursts of updates do not make
+    the rate jump around.
+    """
+
+    def __init__(self, smoothing=0.3, min_interval=0.25):
+        """
+        Args:
+            smoothing: Weight of the newest rate sample (0-1); lower is smoother
+            min_interval: Minimum seconds between rate samples
+        """
+        self.smoothing = smoothing
+        self.min_interval = min_interval
+        self.rate = None  # Units per second
+        self._last_done = None
+        self._last_time = None
+        self._latest = None
+
+    def reset(self):
+        self.rate = None
+        self._last_done = None
+        self._last_time = None
+        self._latest = None
+
+    def update(self, done, now=None):
+        now = time.monotonic() if now is None else now
+        self._latest = done
+        if self._last_time is None or done < self._last_done:
+            self._last_done = done
+            self._last_time = now
+            return
+        elapsed = now - self._last_time
+        if elapsed < self.min_interval:
+            return
+        sample = (done - self._last_done) / elapsed
+        self.rate = sample if self.rate is None else self.smoothing * sample + (1 - self.smoothing) * self.rate
+        self._last_done = done
+        self._last_time = now
+
+    def eta(self, total) -> Optional[float]:
+        """Seconds until `total` is reached at the smoothed rate, or None while unknown."""
+        if not self.rate or self._latest is None or total is None:
+            return None
+        return max(0.0, (total - self._latest) / self.rate)
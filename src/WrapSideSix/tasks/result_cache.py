@@ -0,0 +1,106 @@
+# WrapSideSix/tasks/result_cache.py
+
+from collections import OrderedDict
+from typing import Hashable, Optional
+import logging
+import threading
+import time
+
+# Logger Configuration
+logger = logging.getLogger(__name__)
+
+
+class WSResultCache:
+    """
+    Bounded LRU cache with per-entry expiry for run_in_thread results, plus the table of in-flight
+    workers used to share one worker between identical requests.
+
+    Cached values are handed to every caller as-is, so results that callers mutate should be copied.
+
+    Attributes:
+        max_entries (int): Maximum number of cached results; the least recently used is evicted first.
+        ttl (Optional[float]): Default time to live in seconds; None keeps entries until evicted.
+    """
+
+    def __init__(self, max_entries=256, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at or None, value)
+        self._in_flight = {}  # key -> worker
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0  # Requests attached to an identical in-flight worker
+
+    def __len__(self):
+        return len(self._entries)
+
+    def configure(self, max_entries=None, ttl=...):
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if ttl is not ...:
+            self.ttl = ttl
+        with self._lock:
+            self._evict()
+
+    def get(self, key: Hashable):
+        """Returns (True, value) for a live entry, (False, None) otherwise."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl if ttl is not None else None, value)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def invalidate(self, key: Hashable = None):
+        """Drops the entry for `key`, or every entry when `key` is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # In-flight deduplication
+    def in_flight(self, key: Hashable, attach=None):
+        """
+        Returns the worker computing `key` if it has not produced an outcome yet, else None.
+
+        `attach(worker)` is called under the cache lock, so the worker cannot settle (see `end()`) between
+        the check and the caller connecting its callbacks.
+        """
+        with self._lock:
+            worker = self._in_flight.get(key)
+            if worker is None or worker.record.outcome is not None or worker.is_cancelled():
+                return None
+            self.shared += 1
+            if attach is not None:
+                attach(worker)
+            return worker
+
+    def begin(self, key: Hashable, worker):
+        with self._lock:
+            self._in_flight[key] = worker
+
+    def end(self, key: Hashable, worker):
+        with self._lock:
+            if self._in_flight.get(key) is worker:
+                del self._in_flight[key]
+
+
+result_cache = WSResultCache()
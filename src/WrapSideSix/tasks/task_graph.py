@@ -0,0 +1,280 @@
+# WrapSideSix/tasks/task_graph.py
+
+from PySide6.QtCore import QObject, Signal
+from dataclasses import dataclass, field
+from functools import partial
+import logging
+import time
+
+from .thread_runner import run_in_thread, _move_to_app_thread
+from ..ws_core import WSTaskPriority
+
+# Logger Configuration
+logger = logging.getLogger(__name__)
+
+
+class _GraphSignals(QObject):
+    node_started = Signal(str)
+    node_finished = Signal(str, object)
+    node_failed = Signal(str, tuple)  # (node name, (exception, traceback))
+    node_skipped = Signal(str)  # Not run because a dependency failed or the graph was cancelled
+    finished = Signal(object)  # {node name: result}
+    error = Signal(str, tuple)  # First failed node and its (exception, traceback)
+    cancelled = Signal()
+
+
+@dataclass
+class _Node:
+    name: str
+    fn: object
+    depends_on: tuple
+    args: tuple
+    kwargs: dict
+    run_options: dict
+    dependants: list = field(default_factory=list)
+    state: str = 'pending'  # pending, running, finished, failed, skipped
+    waiting_on: int = 0
+    worker: object = None
+    result: object = None
+
+
+class WSTaskGraph:
+    """
+    Runs background tasks in dependency order on the thread pool.
+
+    Nodes whose dependencies are done run concurrently through run_in_thread. A node's function
+    receives the results of its dependencies as leading positional arguments, in `depends_on` order.
+    When a node fails, every node downstream of it is skipped while independent branches keep running.
+    After a run, `critical_path()` reports the chain of nodes that determined the total duration.
+
+    Example:
+        graph = WSTaskGraph()
+        graph.add("config", load_config)
+        graph.add("db", open_database, depends_on=["config"])
+        graph.add("cache", warm_cache, depends_on=["config"])
+        graph.add("ui_data", load_ui_data, depends_on=["db", "cache"])
+        graph.run(on_finish=start_ui, on_error=show_startup_error)
+    """
+
+    def __init__(self, pool=None, priority=WSTaskPriority.NORMAL, parent=None):
+        self.pool = pool
+        self.priority = priority
+        self.parent = parent
+        self.signals = _move_to_app_thread(_GraphSignals())
+        self.results = {}
+        self._nodes = {}
+        self._remaining = 0
+        self._error = None
+        self._cancelled = False
+        self._running = False
+        self._started_at = None
+        self._finished_at = None
+        self._callbacks = {}  # Callbacks passed to the current run(), replaced on every run
+
+    def add(self, name, fn, depends_on=(), args=(), kwargs=None, **run_options):
+        """
+        Adds a node.
+
+        Args:
+            name: Unique node name
+            fn: Function run as fn(*dependency_results, *args, **kwargs)
+            depends_on: Names of the nodes that must finish first
+            args: Extra positional arguments
+            kwargs: Extra keyword arguments
+            **run_options: run_in_thread options for this node (pool, priority, progress_rate, ...)
+
+        Returns:
+            str: The node name
+        """
+        if self._running:
+            raise RuntimeError("Cannot add nodes to a running task graph.")
+        if name in self._nodes:
+            raise ValueError(f"Duplicate task graph node '{name}'.")
+        self._nodes[name] = _Node(name, fn, tuple(depends_on), tuple(args), dict(kwargs or {}), run_options)
+        return name
+
+    def _validate(self):
+        for node in self._nodes.values():
+            node.dependants = []
+        for node in self._nodes.values():
+            for dependency in node.depends_on:
+                if dependency not in self._nodes:
+                    raise ValueError(f"Node '{node.name}' depends on unknown node '{dependency}'.")
+                self._nodes[dependency].dependants.append(node.name)
+
+        # Kahn's algorithm: a cycle leaves nodes that never reach zero remaining dependencies
+        remaining = {name: len(node.depends_on) for name, node in self._nodes.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for dependant in self._nodes[name].dependants:
+                remaining[dependant] -= 1
+                if remaining[dependant] == 0:
+                    ready.append(dependant)
+        if visited != len(self._nodes):
+            cyclic = sorted(name for name, count in remaining.items() if count > 0)
+            raise ValueError(f"Task graph has a dependency cycle involving: {', '.join(cyclic)}")
+
+    def run(self, on_finish=None, on_error=None, on_cancel=None, on_node_finish=None):
+        """
+        Validates the graph and starts every node without dependencies.
+
+        Args:
+            on_finish: Callback with {node name: result} once every node has finished
+            on_error: Callback (node name, (exception, traceback)) for the first failure, called once the
+                remaining independent nodes are done
+            on_cancel: Callback when the graph was cancelled
+            on_node_finish: Callback (node name, result) for each finished node
+
+        The callbacks apply to this run only; connect to `signals` to follow every run.
+
+        Raises:
+            ValueError: For unknown dependencies or dependency cycles.
+        """
+        if self._running:
+            raise RuntimeError("Task graph is already running.")
+        self._validate()
+
+        self._callbacks = {'finish': on_finish, 'error': on_error, 'cancel': on_cancel,
+                           'node_finish': on_node_finish}
+        self.results = {}
+        self._error = None
+        self._cancelled = False
+        self._running = True
+        self._remaining = len(self._nodes)
+        self._started_at = time.monotonic()
+        self._finished_at = None
+        for node in self._nodes.values():
+            node.state = 'pending'
+            node.waiting_on = len(node.depends_on)
+            node.worker = None
+            node.result = None
+
+        if not self._nodes:
+            self._complete()
+            return
+        for node in list(self._nodes.values()):
+            if node.waiting_on == 0:
+                self._start(node)
+
+    def cancel(self):
+        """Skips every node that has not started and cancels the running ones."""
+        if not self._running:
+            return
+        self._cancelled = True
+        for node in self._nodes.values():
+            if node.state == 'running':
+                node.worker.cancel()
+            elif node.state == 'pending':
+                self._skip(node)
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def _start(self, node):
+        node.state = 'running'
+        options = {'pool': self.pool, 'priority': self.priority, 'parent': self.parent, **node.run_options}
+        dependency_results = [self._nodes[name].result for name in node.depends_on]
+        node.worker = run_in_thread(node.fn, *dependency_results, *node.args,
+                                    on_start=partial(self.signals.node_started.emit, node.name),
+                                    on_finish=partial(self._on_node_finished, node),
+                                    on_error=partial(self._on_node_failed, node),
+                                    on_cancel=partial(self._on_node_cancelled, node),
+                                    **options, **node.kwargs)
+
+    def _on_node_finished(self, node, result):
+        node.state = 'finished'
+        node.result = result
+        self.results[node.name] = result
+        self.signals.node_finished.emit(node.name, result)
+        self._callback('node_finish', node.name, result)
+        self._node_done()
+        for name in node.dependants:
+            dependant = self._nodes[name]
+            dependant.waiting_on -= 1
+            if dependant.waiting_on == 0 and dependant.state == 'pending':
+                self._start(dependant)
+
+    def _on_node_failed(self, node, err):
+        node.state = 'failed'
+        if self._error is None:
+            self._error = (node.name, err)
+        self.signals.node_failed.emit(node.name, err)
+        self._skip_downstream(node)
+        self._node_done()
+
+    def _on_node_cancelled(self, node):
+        node.state = 'skipped'
+        self.signals.node_skipped.emit(node.name)
+        self._skip_downstream(node)
+        self._node_done()
+
+    def _skip_downstream(self, node):
+        for name in node.dependants:
+            dependant = self._nodes[name]
+            if dependant.state == 'pending':
+                self._skip(dependant)
+
+    def _skip(self, node):
+        node.state = 'skipped'
+        self.signals.node_skipped.emit(node.name)
+        self._skip_downstream(node)
+        self._node_done()
+
+    def _node_done(self):
+        self._remaining -= 1
+        if self._remaining == 0:
+            self._complete()
+
+    def _complete(self):
+        self._running = False
+        self._finished_at = time.monotonic()
+        if self._error is not None:
+            self.signals.error.emit(*self._error)
+            self._callback('error', *self._error)
+        elif self._cancelled:
+            self.signals.cancelled.emit()
+            self._callback('cancel')
+        else:
+            results = dict(self.results)
+            self.signals.finished.emit(results)
+            self._callback('finish', results)
+
+    def _callback(self, name, *args):
+        callback = self._callbacks.get(name)
+        if callback is not None:
+            callback(*args)
+
+    # Timing
+    def timings(self) -> dict:
+        """{node name: WSTaskRecord} for the nodes that ran (queue wait, run time, thread, outcome)."""
+        return {name: node.worker.record for name, node in self._nodes.items()
+                if node.worker is not None and node.worker.record.finished_at is not None}
+
+    def total_time(self):
+        """Wall-clock seconds from run() until the last node completed (None while running)."""
+        if self._started_at is None or self._finished_at is None:
+            return None
+        return self._finished_at - self._started_at
+
+    def critical_path(self) -> list[tuple[str, float, float]]:
+        """
+        The chain of nodes that determined the total duration, as (name, queue wait, run time) tuples.
+
+        Starting from the node that finished last, each step goes to the dependency that finished last,
+        i.e. the one the node was actually waiting for. Shortening these nodes shortens the whole run.
+        """
+        records = self.timings()
+        if not records:
+            return []
+        name = max(records, key=lambda node_name: records[node_name].finished_at)
+        path = []
+        while name is not None:
+            record = records[name]
+            path.append((name, record.wait_time, record.run_time))
+            dependencies = [dependency for dependency in self._nodes[name].depends_on if dependency in records]
+            name = max(dependencies, key=lambda node_name: records[node_name].finished_at) if dependencies else None
+        path.reverse()
+        return path
@@ -0,0 +1,137 @@
+# WrapSideSix/tasks/task_registry.py
+
+from PySide6.QtCore import QObject
+from functools import partial
+import itertools
+import logging
+import threading
+
+# Logger Configuration
+logger = logging.getLogger(__name__)
+
+
+class _OwnerEntry:
+    """The live tasks of one owner. Dropped with the owner's last task, so an id() is never looked up stale."""
+
+    __slots__ = ('tasks', 'owner', 'connection')
+
+    def __init__(self, owner):
+        self.tasks = set()
+        # Owners without a destroyed signal are kept alive while they have tasks, so their id() cannot be
+        # reused by another object in the meantime
+        self.owner = None if hasattr(owner, 'destroyed') else owner
+        self.connection = None  # The owner's destroyed connection
+
+
+class WSTaskRegistry:
+    """
+    Keeps run_in_thread workers alive while they are queued or running, keyed by task id.
+
+    A worker is released when it emits its `done` signal, after finished, error or cancelled has been
+    delivered. Workers submitted with a QObject parent are also grouped by that parent. When the parent
+    is destroyed, the callbacks it subscribed are disconnected, and its tasks are cancelled unless another
+    caller still shares them through the result cache. Each worker stays registered until the pool has
+    finished with it, so a running QRunnable is never freed early.
+    """
+
+    def __init__(self):
+        self._tasks = {}  # task_id -> worker
+        self._owners = {}  # id(owner) -> _OwnerEntry
+        self._task_owners = {}  # task_id -> set of id(owner)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def register(self, worker, owner=None) -> int:
+        """Registers `worker`, assigns `worker.task_id` and returns it."""
+        task_id = next(self._ids)
+        worker.task_id = task_id
+        with self._lock:
+            self._tasks[task_id] = worker
+        self.add_owner(worker, owner)
+        worker.signals.done.connect(partial(self.release, task_id))
+        return task_id
+
+    def add_owner(self, worker, owner):
+        """Groups a registered worker under another `owner`, e.g. a second caller sharing it by cache key."""
+        if owner is None:
+            return
+        key = id(owner)
+        with self._lock:
+            if worker.task_id not in self._tasks:
+                return
+            entry = self._owners.get(key)
+            new_owner = entry is None
+            if new_owner:
+                entry = self._owners[key] = _OwnerEntry(owner)
+            entry.tasks.add(worker.task_id)
+            self._task_owners.setdefault(worker.task_id, set()).add(key)
+
+        if new_owner and hasattr(owner, 'destroyed'):
+            entry.connection = owner.destroyed.connect(partial(self._on_owner_destroyed, key))
+
+    def release(self, task_id):
+        finished_owners = []
+        with self._lock:
+            self._tasks.pop(task_id, None)
+            for key in self._task_owners.pop(task_id, ()):
+                entry = self._owners.get(key)
+                if entry is not None:
+                    entry.tasks.discard(task_id)
+                    if not entry.tasks:
+                        finished_owners.append(self._owners.pop(key))
+        for entry in finished_owners:
+            if entry.connection is not None:
+                QObject.disconnect(entry.connection)
+
+    def get(self, task_id):
+        return self._tasks.get(task_id)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __contains__(self, task_id):
+        return task_id in self._tasks
+
+    def live_count(self, owner=None) -> int:
+        """Number of live tasks, or of the live tasks submitted with `owner` as parent."""
+        if owner is None:
+            return len(self._tasks)
+        entry = self._owners.get(id(owner))
+        return len(entry.tasks) if entry is not None else 0
+
+    def tasks(self, owner=None) -> list:
+        """The live workers, optionally only those submitted with `owner` as parent."""
+        with self._lock:
+            if owner is None:
+                return list(self._tasks.values())
+            entry = self._owners.get(id(owner))
+            task_ids = entry.tasks if entry is not None else ()
+            return [self._tasks[task_id] for task_id in task_ids if task_id in self._tasks]
+
+    def counts(self) -> dict:
+        """Live task counts by state, for monitoring: {'queued': n, 'running': n, 'total': n}."""
+        queued = running = 0
+        for worker in self.tasks():
+            if worker.state == worker.QUEUED:
+                queued += 1
+            elif worker.state == worker.RUNNING:
+                running += 1
+        return {'queued': queued, 'running': running, 'total': len(self._tasks)}
+
+    def cancel_all(self, owner=None):
+        for worker in self.tasks(owner):
+            worker.cancel()
+
+    def _on_owner_destroyed(self, key, *_):
+        with self._lock:
+            entry = self._owners.pop(key, None)
+            task_ids = entry.tasks if entry is not None else set()
+            workers = [self._tasks[task_id] for task_id in task_ids if task_id in self._tasks]
+            for task_id in task_ids:
+                self._task_owners.get(task_id, set()).discard(key)
+        for worker in workers:
+            if not worker.unsubscribe(key):
+                worker.cancel()  # No caller is left waiting for it
+
+
+task_registry = WSTaskRegistry()
@@ -0,0 +1,116 @@
+# WrapSideSix/tasks/thread_pools.py
+
+from PySide6.QtCore import QThreadPool, QThread
+from dataclasses import dataclass
+from typing import Optional
+import logging
+import threading
+
+# Logger Configuration
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL = "default"  # QThreadPool.globalInstance()
+
+
+def _default_pool_configs():
+    ideal = max(QThread.idealThreadCount(), 1)
+    return {
+        # CPU-bound work gains nothing from more threads than cores
+        "cpu": {"max_threads": ideal},
+        # I/O-bound work mostly waits, so it can use more threads without starving the CPU pool
+        "io": {"max_threads": max(4 * ideal, 8), "expiry_timeout": 60_000},
+    }
+
+
+@dataclass(frozen=True)
+class WSThreadPoolStats:
+    name: str
+    active: int  # Threads currently running a task
+    queued: int  # Tasks submitted through run_in_thread that have not started yet
+    max_threads: int
+
+
+class _PoolRecord:
+    def __init__(self, name, pool):
+        self.name = name
+        self.pool = pool
+        self.queued = 0
+
+
+_pools = {}
+_lock = threading.Lock()
+
+
+def register_thread_pool(name: str, max_threads: Optional[int] = None, expiry_timeout: Optional[int] = None,
+                         stack_size: Optional[int] = None) -> QThreadPool:
+    """
+    Creates the named thread pool, or reconfigures it if it already exists.
+
+    Args:
+        name: Pool name used with run_in_thread(pool=...). "default" is QThreadPool.globalInstance().
+        max_threads: Maximum number of threads in the pool.
+        expiry_timeout: Milliseconds an idle thread is kept alive (-1 keeps threads forever).
+        stack_size: Stack size in bytes for new threads (0 uses the OS default).
+
+    Returns:
+        QThreadPool: The pool.
+    """
+    with _lock:
+        record = _pools.get(name)
+        if record is None:
+            pool = QThreadPool.globalInstance() if name == DEFAULT_POOL else QThreadPool()
+            record = _pools[name] = _PoolRecord(name, pool)
+
+    pool = record.pool
+    if max_threads is not None:
+        pool.setMaxThreadCount(max_threads)
+    if expiry_timeout is not None:
+        pool.setExpiryTimeout(expiry_timeout)
+    if stack_size is not None:
+        pool.setStackSize(stack_size)
+    return pool
+
+
+def _get_record(name: Optional[str]) -> _PoolRecord:
+    name = name or DEFAULT_POOL
+    record = _pools.get(name)
+    if record is None:
+        if name != DEFAULT_POOL and name not in _default_pool_configs():
+            raise KeyError(f"Unknown thread pool '{name}'. Register it with register_thread_pool() first.")
+        register_thread_pool(name, **_default_pool_configs().get(name, {}))
+        record = _pools[name]
+    return record
+
+
+def get_thread_pool(name: Optional[str] = None) -> QThreadPool:
+    """Returns the named pool. "cpu" and "io" are created with default sizes on first use."""
+    return _get_record(name).pool
+
+
+def thread_pool_names() -> list[str]:
+    return list(_pools)
+
+
+def thread_pool_stats(name: Optional[str] = None):
+    """
+    Returns WSThreadPoolStats for the named pool, or a {name: WSThreadPoolStats} dict for all pools
+    created so far when `name` is None.
+    """
+    if name is not None:
+        return _stats(_get_record(name))
+    return {record.name: _stats(record) for record in list(_pools.values())}
+
+
+def _stats(record: _PoolRecord) -> WSThreadPoolStats:
+    pool = record.pool
+    return WSThreadPoolStats(record.name, pool.activeThreadCount(), record.queued, pool.maxThreadCount())
+
+
+def _task_queued(record: _PoolRecord):
+    with _lock:
+        record.queued += 1
+
+
+def _task_dequeued(record: _PoolRecord):
+    with _lock:
+        record.queued -= 1
@@ -1,90 +1,634 @@
 # WrapSideSix/tasks/thread_runner.py
 
-from PySide6.QtCore import QObject, Signal, Slot, QRunnable, QThreadPool
+from PySide6.QtCore import QObject, Signal, Slot, QRunnable, QCoreApplication, QTimer
+import heapq
+import inspect
+import itertools
 import logging
+import os
+import threading
+import time
 import traceback
+import warnings
+
+from .thread_pools import _get_record, _task_queued, _task_dequeued
+from .task_registry import task_registry
+from .result_cache import result_cache
+from .metrics import task_metrics, task_name, WSTaskRecord
+from .progress_events import WSProgressEvent
+from ..ws_core import WSTaskPriority
 
 # Logger Configuration
 logger = logging.getLogger(__name__)
 
+
+class WSTaskCancelled(Exception):
+    """Raised inside a task by WSCancellationToken.raise_if_cancelled() to stop cooperatively."""
+
+
+class WSTaskTimeout(TimeoutError):
+    """Delivered through on_error when a task runs longer than its run_in_thread timeout."""
+
+
+class WSCancellationToken:
+    """
+    Cooperative cancellation flag shared between the GUI thread and a background task.
+
+    Tasks that declare a `cancel_token` parameter receive one from run_in_thread and should check it
+    regularly, either with `is_cancelled()` or `raise_if_cancelled()`. `wait()` can replace time.sleep()
+    in polling loops so a cancelled task wakes up immediately.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise WSTaskCancelled()
+
+    def wait(self, timeout=None) -> bool:
+        """Blocks for up to `timeout` seconds; returns True as soon as the token is cancelled."""
+        return self._event.wait(timeout)
+
+
+def _accepts_kwarg(fn, name):
+    """True if `fn` takes a keyword argument called `name` (explicitly or through **kwargs)."""
+    try:
+        parameters = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+    return name in parameters or any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values())
+
+
+def _move_to_app_thread(qobject):
+    """Moves `qobject` to the GUI thread so its queued signals are delivered there, wherever it was created."""
+    app = QCoreApplication.instance()
+    if app is not None and qobject.thread() is not app.thread():
+        qobject.moveToThread(app.thread())
+    return qobject
+
+
+class _ProgressThrottle:
+    """
+    Progress callback that forwards values to `emit` at most `rate` times per second.
+
+    Values equal to the latest reported one are dropped, and values arriving within the interval are
+    held back so that only the latest is delivered. A held-back value is delivered by the timer thread
+    once the interval has passed, so progress never lags by more than one interval even if the task
+    goes quiet. `flush()` delivers it at once, so the final progress always reaches the GUI.
+    """
+
+    _NOTHING = object()
+
+    def __init__(self, emit, rate):
+        self.emit = emit
+        self.interval = 1.0 / rate
+        self.last_value = self._NOTHING
+        self.last_time = float('-inf')
+        self.pending = self._NOTHING
+        self.delivered = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._flush_scheduled = False
+
+    def __call__(self, value):
+        with self._lock:
+            latest = self.pending if self.pending is not self._NOTHING else self.last_value
+            if value == latest:
+                self.dropped += 1
+                return
+            if self.pending is not self._NOTHING:
+                self.dropped += 1  # Superseded by this value
+                if value == self.last_value:
+                    self.pending = self._NOTHING  # Back to the delivered value; nothing left to deliver
+                    return
+            now = time.monotonic()
+            if now - self.last_time >= self.interval:
+                self._deliver(value, now)
+            else:
+                self.pending = value
+                if not self._flush_scheduled:
+                    self._flush_scheduled = True
+                    _timer_thread.call_later(self.last_time + self.interval - now, self._trailing_flush)
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _trailing_flush(self):
+        with self._lock:
+            self._flush_scheduled = False
+            self._flush()
+
+    def _flush(self):
+        pending = self.pending
+        if pending is not self._NOTHING and pending != self.last_value:
+            self._deliver(pending, time.monotonic())
+        self.pending = self._NOTHING
+
+    def _deliver(self, value, now):
+        self.pending = self._NOTHING
+        self.last_value = value
+        self.last_time = now
+        self.delivered += 1
+        self.emit(value)
+
+
+class _ProgressEventBatch:
+    """
+    Collects WSProgressEvents on the worker thread and emits them as one list at most `rate` times per
+    second, so a burst of events costs one queued signal. A batch keeps only the newest event per stage.
+    Like _ProgressThrottle, a held-back batch is delivered by the timer thread within one interval.
+    """
+
+    def __init__(self, emit, rate):
+        self.emit = emit
+        self.interval = 1.0 / rate if rate else 0.0
+        self.pending = {}  # stage -> newest event
+        self.last_time = float('-inf')
+        self._lock = threading.Lock()
+        self._flush_scheduled = False
+
+    def __call__(self, event):
+        with self._lock:
+            self.pending.pop(event.stage, None)
+            self.pending[event.stage] = event
+            now = time.monotonic()
+            if now - self.last_time >= self.interval:
+                self._flush(now)
+            elif not self._flush_scheduled:
+                self._flush_scheduled = True
+                _timer_thread.call_later(self.last_time + self.interval - now, self._trailing_flush)
+
+    def flush(self, now=None):
+        with self._lock:
+            self._flush(now)
+
+    def _trailing_flush(self):
+        with self._lock:
+            self._flush_scheduled = False
+            self._flush()
+
+    def _flush(self, now=None):
+        if self.pending:
+            batch = list(self.pending.values())
+            self.pending = {}
+            self.last_time = time.monotonic() if now is None else now
+            self.emit(batch)
+
+
+class _ProgressChannel:
+    """
+    The progress_callback handed to tasks. Numbers go to `emit_progress`, throttled unless `rate` is None
+    or 0. WSProgressEvents are batched for `emit_events`, and their percentage also goes to the numeric
+    channel so plain on_progress consumers keep working.
+    """
+
+    def __init__(self, emit_progress, emit_events, rate):
+        self.throttle = _ProgressThrottle(emit_progress, rate) if rate else None
+        self.numeric = self.throttle if self.throttle is not None else emit_progress
+        self.events = _ProgressEventBatch(emit_events, rate)
+
+    def __call__(self, value):
+        if isinstance(value, WSProgressEvent):
+            self.events(value)
+            value = value.percent
+            if value is None:
+                return
+        self.numeric(value)
+
+    def flush(self):
+        """Delivers held-back values; called when the task returns."""
+        if self.throttle is not None:
+            self.throttle.flush()
+        self.events.flush()
+
+
+class _TimerHandle:
+    """Returned by _TimerThread.call_later; `cancel()` drops the callback and everything it references."""
+
+    __slots__ = ('callback',)
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def cancel(self):
+        self.callback = None
+
+
+class _TimerThread:
+    """
+    One daemon thread that runs short callbacks at deadlines, for code that has no event loop to post
+    timers to: task timeouts and trailing progress flushes. Callbacks run on this thread and must not block.
+    """
+
+    def __init__(self):
+        self._deadlines = []  # Heap of (deadline, sequence, _TimerHandle)
+        self._compact_at = 64
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._pid = None
+
+    def call_later(self, delay, callback) -> _TimerHandle:
+        if self._pid != os.getpid():
+            # First use, or a forked process pool child that inherited the state but not the thread
+            self._deadlines = []
+            self._condition = threading.Condition()
+            self._thread = None
+            self._pid = os.getpid()
+        handle = _TimerHandle(callback)
+        with self._condition:
+            deadlines = self._deadlines
+            if len(deadlines) >= self._compact_at:
+                # Drop cancelled entries, so cancelled long deadlines do not pile up; amortised O(1) per call
+                deadlines[:] = [entry for entry in deadlines if entry[2].callback is not None]
+                heapq.heapify(deadlines)
+                self._compact_at = max(64, 2 * len(deadlines))
+            heapq.heappush(deadlines, (time.monotonic() + max(0.0, delay), next(self._sequence), handle))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="WSTimerThread", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return handle
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._deadlines:
+                    self._condition.wait()
+                deadline, _, handle = self._deadlines[0]
+                remaining = deadline - time.monotonic()
+                if remaining > 0 and handle.callback is not None:
+                    self._condition.wait(remaining)
+                    continue
+                heapq.heappop(self._deadlines)
+                callback, handle.callback = handle.callback, None
+            if callback is None:
+                continue  # Cancelled
+            try:
+                callback()
+            except Exception:
+                logger.exception("Error in timer thread callback")
+
+
+_timer_thread = _TimerThread()
+
+
 class _WorkerSignals(QObject):
     finished = Signal(object)
     error = Signal(tuple)  # (exception, traceback)
     progress = Signal(float)
+    progress_events = Signal(list)  # Batches of WSProgressEvent
     started = Signal()
+    cancelled = Signal()
+    done = Signal()  # Emitted last, whatever the outcome; used for bookkeeping
+
+def _connect_callbacks(signals, on_finish=None, on_error=None, on_progress=None, on_start=None, on_cancel=None,
+                       on_progress_events=None) -> list:
+    """Connects the given callbacks and returns their connections."""
+    connections = []
+    for signal, callback in ((signals.finished, on_finish), (signals.error, on_error),
+                             (signals.progress, on_progress), (signals.started, on_start),
+                             (signals.cancelled, on_cancel), (signals.progress_events, on_progress_events)):
+        if callback:
+            connections.append(signal.connect(callback))
+    return connections
+
+
+class _TaskSubscribers:
+    """
+    Callback bookkeeping shared by the task handles. Every run_in_thread call served by a handle subscribes
+    its callbacks under its parent (None without one), so that a destroyed parent only takes its own
+    callbacks with it while the other callers sharing the handle keep theirs.
+    """
+
+    def subscribe(self, owner, connections):
+        key = id(owner) if owner is not None else None
+        self._subscribers.setdefault(key, []).extend(connections)
+
+    def unsubscribe(self, owner_key) -> bool:
+        """Disconnects the callbacks subscribed under `owner_key`; returns whether other subscribers remain."""
+        for connection in self._subscribers.pop(owner_key, ()):
+            QObject.disconnect(connection)
+        return bool(self._subscribers)
+
+    def detach(self):
+        """Disconnects all callbacks, e.g. because the object they belong to is being destroyed."""
+        for owner_key in list(self._subscribers):
+            self.unsubscribe(owner_key)
+
+
+class _CachedTask(_TaskSubscribers):
+    """Handle returned by run_in_thread when the result is served from the result cache."""
+
+    QUEUED, RUNNING, DONE = range(3)
+
+    def __init__(self, fn, result):
+        self.task_id = None
+        self.result = result
+        self.state = _CachedTask.QUEUED
+        # Completed on delivery with zero run time and no attempts, so timing reports can include it
+        self.record = WSTaskRecord(None, task_name(fn), '', time.monotonic())
+        self.signals = _move_to_app_thread(_WorkerSignals())
+        self._subscribers = {}
+        self._cancelled = False
+
+    def cancel(self) -> bool:
+        self._cancelled = True
+        return True
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def is_done(self) -> bool:
+        return self.state == _CachedTask.DONE
+
+    def _deliver(self):
+        # Delivered on the next event-loop turn, like a worker's callbacks
+        self.state = _CachedTask.DONE
+        self.record.started_at = self.record.finished_at = time.monotonic()
+        self.record.outcome = 'cancelled' if self._cancelled else 'finished'
+        if self._cancelled:
+            self.signals.cancelled.emit()
+        else:
+            self.signals.started.emit()
+            self.signals.finished.emit(self.result)
+        self.signals.done.emit()
+
 
-class _Worker(QRunnable):
-    def __init__(self, fn, *args, on_finish=None, on_error=None, on_progress=None, on_start=None,  **kwargs):
+class _Worker(_TaskSubscribers, QRunnable):
+    # Lifecycle states; only a queued worker can still be taken back from the pool
+    QUEUED, RUNNING, DONE = range(3)
+
+    # Maximum progress updates per second delivered to the GUI thread
+    DEFAULT_PROGRESS_RATE = 30
+
+    def __init__(self, fn, *args, on_finish=None, on_error=None, on_progress=None, on_start=None,
+                 on_cancel=None, on_progress_events=None, progress_rate=DEFAULT_PROGRESS_RATE, retries=0,
+                 backoff=0.0, retry_on=(Exception,), timeout=None, **kwargs):
         super().__init__()
         self.fn = fn
         self.args = args
         self.kwargs = kwargs
-        self.signals = _WorkerSignals()
-
-        if on_finish:
-            self.signals.finished.connect(on_finish)
-        if on_error:
-            self.signals.error.connect(on_error)
-        if on_progress:
-            self.signals.progress.connect(on_progress)
-        if on_start:
-            self.signals.started.connect(on_start)
-
-        # Add progress callback if function supports it
+        self.retries = retries
+        self.backoff = backoff
+        self.retry_on = retry_on
+        self.timeout = timeout
+        self.cache_key = None  # Set by run_in_thread(cache_key=...)
+        self.cache_ttl = None
+        self._finish_lock = threading.Lock()
+        self._timeout_handle = None
+        self.signals = _move_to_app_thread(_WorkerSignals())
+        self.task_id = None
+        self.pool = None
+        self.pool_record = None
+        self.state = _Worker.QUEUED
+        self.cancel_token = kwargs.get('cancel_token') or WSCancellationToken()
+        self.record = WSTaskRecord(None, task_name(fn), '', time.monotonic())
+
+        self._subscribers = {}
+        self.subscribe(None, _connect_callbacks(self.signals, on_finish, on_error, on_progress, on_start, on_cancel,
+                                                on_progress_events))
+
+        # Add progress callback if function supports it, throttled unless progress_rate is None or 0
+        self.progress_channel = None
+        self.progress_throttle = None
         if 'progress_callback' not in kwargs:
-            self.kwargs['progress_callback'] = self.signals.progress.emit
+            self.progress_channel = _ProgressChannel(self.signals.progress.emit, self.signals.progress_events.emit,
+                                                     progress_rate)
+            self.progress_throttle = self.progress_channel.throttle
+            self.kwargs['progress_callback'] = self.progress_channel
+
+        # Add the cancellation token only if the function asks for it
+        if 'cancel_token' not in kwargs and _accepts_kwarg(fn, 'cancel_token'):
+            self.kwargs['cancel_token'] = self.cancel_token
+
+    def cancel(self) -> bool:
+        """
+        Requests cancellation of the task.
+
+        A task still waiting in the pool queue is removed from it and `cancelled` is emitted right away.
+        A running task is told through its cancellation token and emits `cancelled` (instead of
+        `finished`) when it returns or raises WSTaskCancelled.
+
+        Returns:
+            bool: True if the task was removed from the queue before it started.
+        """
+        self.cancel_token.cancel()
+        if self.state == _Worker.QUEUED and self.pool is not None and self.pool.tryTake(self):
+            self.state = _Worker.DONE
+            _task_dequeued(self.pool_record)
+            self._finish('cancelled')
+            self.signals.done.emit()
+            return True
+        return False
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_token.is_cancelled()
+
+    def is_done(self) -> bool:
+        """True once the task has an outcome; its signal may still be on its way to the GUI thread."""
+        return self.record.outcome is not None
 
     @Slot()
     def run(self):
-        self.signals.started.emit()
+        self.state = _Worker.RUNNING
+        _task_dequeued(self.pool_record)
+        self.record.started_at = time.monotonic()
+        self.record.thread_name = threading.current_thread().name
+        try:
+            if self.cancel_token.is_cancelled():
+                self._finish('cancelled')
+                return
+            self.signals.started.emit()
+            if self.timeout is not None:
+                self._timeout_handle = _timer_thread.call_later(self.timeout, self._time_out)
+            try:
+                result = self._call_with_retries()
+            except WSTaskCancelled:
+                self._finish('cancelled')
+            except Exception as e:
+                if self._finish('error', (e, traceback.format_exc())):
+                    logger.error(f"Error in worker thread: {str(e)}")
+            else:
+                if self.cancel_token.is_cancelled():
+                    self._finish('cancelled')  # The result is no longer wanted
+                else:
+                    self._finish('finished', result)
+        finally:
+            self.state = _Worker.DONE
+            self.signals.done.emit()
+
+    def _finish(self, outcome, payload=None) -> bool:
+        """
+        Records the outcome in task_metrics and emits the matching signal. Only the first outcome counts,
+        so a task that returns after its timeout has fired is ignored.
+        """
+        record = self.record
+        with self._finish_lock:
+            if record.outcome is not None:
+                return False
+            record.finished_at = time.monotonic()
+            record.outcome = outcome
+        if self._timeout_handle is not None:
+            self._timeout_handle.cancel()  # The timer would otherwise keep this worker alive until the deadline
+        task_metrics.record(record)
+        if self.cache_key is not None:
+            # Before emitting, so a caller arriving meanwhile finds the result instead of this worker
+            if outcome == 'finished':
+                result_cache.put(self.cache_key, payload, ttl=self.cache_ttl)
+            result_cache.end(self.cache_key, self)
+        if outcome == 'finished':
+            self.signals.finished.emit(payload)
+        elif outcome in ('error', 'timeout'):
+            self.signals.error.emit(payload)
+        else:
+            self.signals.cancelled.emit()
+        return True
+
+    def _time_out(self):
+        """
+        Called on the timer thread: fails the task and stops further progress callbacks.
+
+        Python threads cannot be interrupted, so a timed-out task keeps its pool thread until it returns;
+        its cancellation token is set so cooperative tasks stop early, and whatever it returns is dropped.
+        """
+        if self.record.outcome is not None:
+            return
+        self.cancel_token.cancel()
+        error = WSTaskTimeout(f"{self.record.name} did not finish within {self.timeout} seconds")
+        if self._finish('timeout', (error, ''.join(traceback.format_exception_only(error)))):
+            logger.error(f"Error in worker thread: {str(error)}")
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                for signal in (self.signals.progress, self.signals.progress_events):
+                    try:
+                        signal.disconnect()
+                    except (RuntimeError, TypeError):
+                        pass
+
+    def _call_with_retries(self):
+        attempt = 0
+        while True:
+            attempt += 1
+            self.record.attempts = attempt
+            try:
+                return self._call()
+            except WSTaskCancelled:
+                raise
+            except self.retry_on as e:
+                if attempt > self.retries or self.cancel_token.is_cancelled():
+                    raise
+                delay = self.backoff * 2 ** (attempt - 1)
+                logger.warning(f"Retrying {self.record.name} in {delay:.2f}s after attempt {attempt} of "
+                               f"{self.retries + 1} failed: {str(e)}")
+                if delay and self.cancel_token.wait(delay):
+                    raise WSTaskCancelled()
+
+    def _call(self):
         try:
-            result = self.fn(*self.args, **self.kwargs)
-            self.signals.finished.emit(result)
-        except Exception as e:
-            logger.error(f"Error in worker thread: {str(e)}")
-            self.signals.error.emit((e, traceback.format_exc()))
-
-def run_in_thread(fn, *args, on_finish=None, on_error=None, on_progress=None, on_start=None,
-                 parent=None, **kwargs):
+            return self.fn(*self.args, **self.kwargs)
+        finally:
+            if self.progress_channel is not None:
+                self.progress_channel.flush()  # Deliver the final values before finished/error
+
+def run_in_thread(fn, *args, on_finish=None, on_error=None, on_progress=None, on_start=None, on_cancel=None,
+                 on_progress_events=None, parent=None, pool=None, priority=WSTaskPriority.NORMAL,
+                 progress_rate=_Worker.DEFAULT_PROGRESS_RATE, cache_key=None, cache_ttl=None,
+                 retries=0, backoff=0.0, retry_on=(Exception,), timeout=None, **kwargs):
     """
     Runs `fn(*args, **kwargs)` in a background thread using QThreadPool.
 
+    If `fn` declares a `cancel_token` parameter it receives a WSCancellationToken; calling `cancel()` on
+    the returned worker sets it, or removes the worker from the pool queue if it has not started yet.
+
     Args:
         fn: Function to execute
         *args: Arguments to pass to the function
         on_finish: Callback for successful completion
         on_error: Callback for errors
-        on_progress: Callback for progress updates
+        on_progress: Callback for progress updates (0-100). A WSProgressEvent passed to `progress_callback`
+            is reported here as its percentage, when it has one.
         on_start: Callback when the thread begins execution
-        parent: Parent object to prevent worker garbage collection
+        on_cancel: Callback when the task is cancelled
+        on_progress_events: Callback with lists of the WSProgressEvents the task reported, batched at
+            `progress_rate` and keeping the newest event per stage
+        parent: Owner of the task. Its tasks are cancelled and their callbacks disconnected when it is
+            destroyed (QObject parents only); see task_registry.live_count(parent).
+        pool: Name of the thread pool to run on ("default", "cpu", "io" or one added with
+            register_thread_pool). Defaults to QThreadPool.globalInstance().
+        priority: WSTaskPriority (or int). Queued tasks with a higher priority start first; running tasks
+            are not preempted.
+        progress_rate: Maximum progress updates per second sent to the GUI thread. Repeated values are
+            dropped and the last reported value is always delivered. None or 0 sends every update.
+        cache_key: Opt-in result caching. A call whose key matches a worker still in flight shares that
+            worker: cancelling it cancels it for every caller, while a destroyed parent only disconnects
+            its own callbacks and the worker is cancelled once no caller is left. A key with a live entry
+            in `result_cache` is answered from the cache without running `fn`. Successful results are cached.
+        cache_ttl: Time to live in seconds for this result, overriding `result_cache.ttl`
+        retries: Number of extra attempts after `fn` raises one of `retry_on`. Retries run inside the
+            worker thread; on_error only sees the last failure.
+        backoff: Delay in seconds before the first retry, doubled for each further retry. Cancelling the
+            task during the delay stops it immediately.
+        retry_on: Exception type or tuple of types worth retrying, e.g. OSError for flaky file shares
+        timeout: Seconds the task may run (all attempts included, queue time excluded). When exceeded,
+            on_error receives a WSTaskTimeout, the cancellation token is set and any later result is
+            dropped; the pool thread is only freed once `fn` returns.
         **kwargs: Keyword arguments to pass to the function
 
     Returns:
-        The worker instance
+        The worker instance, which also serves as the task handle (`cancel()`, `is_cancelled()`)
     """
-    worker = _Worker(fn, *args, on_finish=on_finish, on_error=on_error,
-                    on_progress=on_progress, on_start=on_start, **kwargs)
-
-    # Store worker reference to prevent garbage collection
-    if parent is not None:
-        # Use a more appropriate attribute name without underscore
-        if not hasattr(parent, "active_workers"):
-            parent.active_workers = []
-        parent.active_workers.append(worker)
-
-        # Auto-remove on finish/error to prevent memory leak
-        def _cleanup(_):
-            try:
-                if hasattr(parent, "active_workers") and worker in parent.active_workers:
-                    parent.active_workers.remove(worker)
-            except (ValueError, RuntimeError):
-                pass
+    def subscribe(task):
+        task.subscribe(parent, _connect_callbacks(task.signals, on_finish, on_error, on_progress, on_start,
+                                                  on_cancel, on_progress_events))
+
+    if cache_key is not None:
+        found, result = result_cache.get(cache_key)
+        if found:
+            task = _CachedTask(fn, result)
+            subscribe(task)
+            task_registry.register(task, owner=parent)
+            task.record.task_id = task.task_id
+            QTimer.singleShot(0, task._deliver)
+            return task
+
+        def attach(shared):
+            subscribe(shared)
+            task_registry.add_owner(shared, parent)
+
+        shared = result_cache.in_flight(cache_key, attach)
+        if shared is not None:
+            return shared
+
+    worker = _Worker(fn, *args, progress_rate=progress_rate, retries=retries, backoff=backoff,
+                     retry_on=retry_on, timeout=timeout, **kwargs)
+    subscribe(worker)
+
+    # Keep the worker alive until it is done; released automatically through its `done` signal
+    task_registry.register(worker, owner=parent)
 
-        worker.signals.finished.connect(_cleanup)
-        worker.signals.error.connect(lambda _: _cleanup(None))
+    if cache_key is not None:
+        # _Worker._finish caches the result and leaves the in-flight table before emitting the outcome
+        worker.cache_key = cache_key
+        worker.cache_ttl = cache_ttl
+        result_cache.begin(cache_key, worker)
 
     # Set auto-delete and start the worker
     worker.setAutoDelete(True)
-    QThreadPool.globalInstance().start(worker)
+    worker.pool_record = _get_record(pool)
+    worker.pool = worker.pool_record.pool
+    worker.record.task_id = worker.task_id
+    worker.record.pool = worker.pool_record.name
+    worker.record.enqueued_at = time.monotonic()
+    _task_queued(worker.pool_record)
+    worker.pool.start(worker, int(priority))
 
     return worker
@@ -0,0 +1,113 @@
+# widgets/list_search_index.py
+
+from collections import defaultdict
+from typing import Hashable, Iterable, Optional
+import logging
+
+# Logger Configuration
+logger = logging.getLogger(__name__)
+
+
+class WSNgramIndex:
+    """
+    Case-insensitive substring index over display texts, keyed by any hashable key (e.g. item IDs).
+
+    Every text is split into its distinct n-grams and each n-gram keeps the set of keys containing it.
+    A query of at least n characters intersects the postings of its n-grams (smallest first) and only the
+    surviving candidates are checked with a real substring test. Shorter queries union the postings of
+    the n-grams containing them; texts shorter than n are kept aside and checked directly.
+
+    Attributes:
+        n (int): The n-gram length. Defaults to 3.
+    """
+
+    def __init__(self, n=3):
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        self.n = n
+        self._grams = defaultdict(set)
+        self._texts = {}  # key -> folded text
+        self._short_keys = set()  # Keys whose text is shorter than n
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __contains__(self, key):
+        return key in self._texts
+
+    def _grams_of(self, folded):
+        n = self.n
+        return {folded[i:i + n] for i in range(len(folded) - n + 1)}
+
+    def add(self, key: Hashable, text: str):
+        """Indexes `text` under `key`, replacing any text already stored for that key."""
+        if key in self._texts:
+            self.remove(key)
+        folded = str(text).casefold()
+        self._texts[key] = folded
+        if len(folded) < self.n:
+            self._short_keys.add(key)
+        for gram in self._grams_of(folded):
+            self._grams[gram].add(key)
+
+    def add_many(self, entries: Iterable[tuple[Hashable, str]]):
+        for key, text in entries:
+            self.add(key, text)
+
+    def remove(self, key: Hashable):
+        folded = self._texts.pop(key, None)
+        if folded is None:
+            return
+        self._short_keys.discard(key)
+        for gram in self._grams_of(folded):
+            postings = self._grams.get(gram)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._grams[gram]
+
+    def clear(self):
+        self._grams.clear()
+        self._texts.clear()
+        self._short_keys.clear()
+
+    def matches(self, key: Hashable, query: str) -> bool:
+        folded = self._texts.get(key)
+        return folded is not None and query.casefold() in folded
+
+    def search(self, query: str, candidates: Optional[set] = None) -> set:
+        """
+        Returns the set of keys whose text contains `query`.
+
+        Args:
+            query: The text to look for (case-insensitive).
+            candidates: Optional superset of the result, typically the result of a shorter query the new
+                one extends while the user types. It is scanned instead of the index when it is smaller
+                than the best posting list.
+        """
+        folded = query.casefold()
+        if not folded:
+            return set(self._texts)
+
+        texts = self._texts
+        if len(folded) >= self.n:
+            postings = sorted((self._grams.get(gram, ()) for gram in self._grams_of(folded)), key=len)
+            if not postings[0]:
+                return set()
+            if candidates is not None and len(candidates) <= len(postings[0]):
+                return {key for key in candidates if folded in texts.get(key, "")}
+            result = set(postings[0]).intersection(*postings[1:])
+            if len(folded) == self.n:
+                return result
+            return {key for key in result if folded in texts.get(key, "")}
+
+        if candidates is not None:
+            return {key for key in candidates if folded in texts.get(key, "")}
+
+        # Any occurrence of a short query in a text of at least n characters lies inside one of its n-grams
+        result = set()
+        for gram, keys in self._grams.items():
+            if folded in gram:
+                result |= keys
+        result.update(key for key in self._short_keys if folded in texts[key])
+        return result
@@ -0,0 +1,111 @@
+# widgets/list_sorting.py
+
+from PySide6.QtCore import QCollator, QLocale, Qt
+from typing import Iterable, Optional
+import logging
+
+# Logger Configuration
+logger = logging.getLogger(__name__)
+
+from ..ws_core import WSSortOrder, WSSortKey
+
+
+def normalize_sort_keys(sort_keys) -> list[WSSortKey]:
+    """Accepts WSSortKey instances or (column, WSSortOrder) tuples and returns a list of WSSortKey."""
+    normalized = []
+    for spec in sort_keys or ():
+        if isinstance(spec, WSSortKey):
+            normalized.append(spec)
+        else:
+            column, order = spec
+            normalized.append(WSSortKey(column, order))
+    return normalized
+
+
+class WSCollationKeyCache:
+    """
+    Caches locale-aware collation keys so each distinct string is transformed only once.
+
+    A QCollator is not safe to share between threads, so `sort_rows` builds its own collator when it is
+    called from a worker and returns the newly computed keys instead of writing them into the cache.
+    Merge them back on the GUI thread with `update()`.
+
+    Attributes:
+        locale (QLocale): The locale used for collation.
+        case_sensitive (bool): Whether upper and lower case strings collate differently.
+        numeric (bool): Whether digit runs are compared by numeric value ("item 9" < "item 10").
+        max_size (int): Number of keys kept. The cache starts over when `update()` would exceed it, so
+            repopulating a list with fresh data does not keep the keys of every earlier list.
+    """
+
+    DEFAULT_MAX_SIZE = 1_000_000
+
+    def __init__(self, locale: Optional[QLocale] = None, case_sensitive=False, numeric=True,
+                 max_size=DEFAULT_MAX_SIZE):
+        self.locale = locale if locale is not None else QLocale()
+        self.case_sensitive = case_sensitive
+        self.numeric = numeric
+        self.max_size = max_size
+        self._keys = {}
+        self._collator = self.new_collator()
+
+    def new_collator(self) -> QCollator:
+        collator = QCollator(self.locale)
+        collator.setCaseSensitivity(Qt.CaseSensitivity.CaseSensitive if self.case_sensitive
+                                    else Qt.CaseSensitivity.CaseInsensitive)
+        collator.setNumericMode(self.numeric)
+        return collator
+
+    def __len__(self):
+        return len(self._keys)
+
+    def clear(self):
+        self._keys.clear()
+
+    def update(self, keys: dict):
+        """Merges keys computed by `sort_rows`, clearing the cache first if it would grow past `max_size`."""
+        if len(self._keys) + len(keys) > self.max_size:
+            self._keys.clear()
+        self._keys.update(keys)
+
+    def sort_rows(self, rows: Iterable, sort_keys: Iterable[WSSortKey], collator: Optional[QCollator] = None):
+        """
+        Stable multi-key sort of `rows` (tuples or lists) using cached collation keys.
+
+        String cells are compared by collation key, other values by their natural ordering and missing
+        cells as an empty string. Keys are precomputed once per row and column before sorting, so the
+        sort itself only compares ready-made keys.
+
+        Args:
+            rows: The rows to sort.
+            sort_keys: The columns to sort on, most significant first.
+            collator: Collator to build missing keys with. Pass a fresh one from `new_collator()` when
+                calling from a worker thread; defaults to the cache's own collator.
+
+        Returns:
+            tuple: (sorted rows, dict of newly computed keys not yet stored in the cache)
+        """
+        collator = collator if collator is not None else self._collator
+        cached = self._keys
+        new_keys = {}
+        rows = list(rows)
+
+        def key_for(value):
+            if not isinstance(value, str):
+                return value
+            key = cached.get(value)
+            if key is None:
+                key = new_keys.get(value)
+                if key is None:
+                    key = new_keys[value] = collator.sortKey(value)
+            return key
+
+        # Python's sort is stable (also with reverse=True), so sorting on the least significant key
+        # first gives a correct multi-key ordering
+        for spec in reversed(list(sort_keys)):
+            column = spec.column
+            keys = [key_for(row[column] if len(row) > column else '') for row in rows]
+            order = sorted(range(len(rows)), key=keys.__getitem__, reverse=spec.order is WSSortOrder.DESCENDING)
+            rows = [rows[i] for i in order]
+
+        return rows, new_keys
@@ -1,21 +1,33 @@
 # widgets/list_widget_py
 
 from PySide6.QtWidgets import QListWidget, QAbstractItemView, QMenu, QListWidgetItem
-from PySide6.QtCore import Signal, Qt
+from PySide6.QtCore import Signal, Qt, QTimer, QItemSelection, QItemSelectionModel
+from bisect import bisect_left, bisect_right
 import logging
 
 # Logger Configuration
 logger = logging.getLogger(__name__)
 
-from ..ws_core import WSSortOrder
+from ..ws_core import WSSortOrder, WSSortKey
+from ..tasks.thread_runner import run_in_thread
+from .list_sorting import WSCollationKeyCache, normalize_sort_keys
+from .list_search_index import WSNgramIndex
 
 class WSListSelectionWidget(QListWidget):
     selection_changed = Signal()
     selected = Signal(int, str)
     doubleClicked = Signal(str, str)
     rightClicked = Signal(int, str)
+    sort_finished = Signal()
+    filter_applied = Signal(int)  # Number of visible rows
 
-    def __init__(self, multi_select=False, actions=None):
+    # Sorting is synchronous unless background=True is passed or a background_sort_threshold is set
+    BACKGROUND_SORT_THRESHOLD = None
+    FILTER_DEBOUNCE_MS = 150
+
+    def __init__(self, multi_select=False, actions=None, action_predicates=None, sort_locale=None,
+                 background_sort_threshold=BACKGROUND_SORT_THRESHOLD, filter_debounce_ms=FILTER_DEBOUNCE_MS,
+                 coalesce_selection=False, selection_debounce_ms=0):
         super().__init__()
 
         # Set selection mode
@@ -24,18 +36,74 @@ class WSListSelectionWidget(QListWidget):
         else:
             self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
 
-        self.actions = actions if actions else {}
+        # Context menu, built on first right-click and rebuilt only when the actions change
+        self._context_menu = None
+        self._context_actions = {}
+        self._context_snapshot = {}
+        self._context_target = (None, None)
+        self.actions = actions
+        # Optional {action_name: fn(item_id, item_name) -> bool}, evaluated each time the menu opens
+        self.action_predicates = action_predicates if action_predicates else {}
+
+        # Rows backing the list, kept so the list can be re-sorted without going through Qt items
+        self._rows = []
+        self._display_index = 1
+        self._id_index = 0
+        self._sort_generation = 0  # Bumped on every sort/clear so stale background sorts are dropped
+        self._key_cache = WSCollationKeyCache(sort_locale)
+        self.background_sort_threshold = background_sort_threshold
+        self._row_by_id = {}
+
+        # Type-ahead filter state; the search index is built on first use
+        self._filter_text = ''
+        self._applied_filter_text = ''
+        self._filter_index = None
+        self._visible_ids = None  # None while no filter is applied
+        self._visible_rows = None  # Sorted row numbers of the visible items
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(filter_debounce_ms)
+        self._filter_timer.timeout.connect(self._apply_filter)
+
+        # Selection signal coalescing; a 0 ms single-shot timer fires once per event-loop turn
+        self.coalesce_selection = coalesce_selection
+        self.selection_emit_count = 0  # Number of selection emissions, for profiling
+        self._selection_timer = QTimer(self)
+        self._selection_timer.setSingleShot(True)
+        self._selection_timer.setInterval(selection_debounce_ms)
+        self._selection_timer.timeout.connect(self.get_data_to_emit)
+
         self.connect_signals()
 
     def connect_signals(self):
-        self.itemSelectionChanged.connect(self.get_data_to_emit)
+        self.itemSelectionChanged.connect(self._on_item_selection_changed)
         self.itemDoubleClicked.connect(self.handle_double_click)
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.handle_right_click)
 
+    @property
+    def actions(self):
+        return self._actions
+
+    @actions.setter
+    def actions(self, actions):
+        self._actions = actions if actions else {}
+        self.invalidate_context_menu()
+
+    def clear(self):
+        """Removes all items and forgets the rows kept for re-sorting. The filter text is kept."""
+        self._rows = []
+        self._row_by_id = {}
+        self._sort_generation += 1
+        self._filter_index = None
+        self._visible_ids = None
+        self._visible_rows = None
+        super().clear()
+
     def add_items(self, items):
         """Simplified method to add items to the list with unique IDs."""
-        existing_ids = set(self.get_all_ids())
+        # Taken from the rows rather than the Qt items, which are empty while a background sort is pending
+        existing_ids = {row[self._id_index] for row in self._rows}
         next_id = max(existing_ids, default=0) + 1  # Ensure uniqueness
 
         for item in items:
@@ -45,17 +113,35 @@ class WSListSelectionWidget(QListWidget):
             list_widget_item = QListWidgetItem(item)
             list_widget_item.setData(Qt.ItemDataRole.UserRole, next_id)
             self.addItem(list_widget_item)
+            self._rows.append(self._make_row(next_id, item))
+            self._row_by_id[next_id] = self.count() - 1
             existing_ids.add(next_id)
 
-    def populate_list(self, items, display_index=1, id_index=0, sort_mode=None):
-        """Clears list and populates it with new items."""
+            if self._filter_index is not None:
+                self._filter_index.add(next_id, item)
+            if self._visible_ids is not None:
+                if self._applied_filter_text.casefold() in item.casefold():
+                    self._visible_ids.add(next_id)
+                    self._visible_rows.append(self.count() - 1)
+                else:
+                    self.setRowHidden(self.count() - 1, True)
+
+    def populate_list(self, items, display_index=1, id_index=0, sort_mode=None, sort_keys=None, background=None):
+        """
+        Clears list and populates it with new items.
+
+        Sorting uses locale-aware collation keys that are computed once per distinct string and cached.
+        `sort_keys` (WSSortKey or (column, WSSortOrder) tuples, most significant first) takes precedence
+        over `sort_mode` and gives a stable multi-key sort over any row column.
+
+        With `background=True` the rows are sorted in a worker thread and the list stays empty until the
+        sort completes. `background=None` does the same for lists with at least `background_sort_threshold`
+        rows, if a threshold was given; otherwise sorting is synchronous. `sort_finished` is emitted once
+        the list has been filled.
+        """
         self.clear()
-
-        if sort_mode == WSSortOrder.ASCENDING:
-            items = sorted(items, key=lambda x: x[display_index] if len(x) > display_index else '')
-        elif sort_mode == WSSortOrder.DESCENDING:
-            items = sorted(items, key=lambda x: x[display_index] if len(x) > display_index else '', reverse=True)
-        # else: leave unsorted
+        self._display_index = display_index
+        self._id_index = id_index
 
         for item in items:
             display_text = item[display_index] if len(item) > display_index else 'Unknown'
@@ -67,15 +153,242 @@ class WSListSelectionWidget(QListWidget):
                 logger.error(f"ERROR! Item ID is 0 -> {display_text}")
 
             if item_id is not None:
+                self._rows.append(item)
+
+        self._apply_sort(self._resolve_sort_keys(sort_mode, sort_keys), background)
+
+    def sort_list(self, sort_mode=WSSortOrder.ASCENDING, sort_keys=None, background=None):
+        """
+        Re-sorts the current rows and keeps the selected item selected.
+
+        Takes the same `sort_mode`, `sort_keys` and `background` arguments as `populate_list`.
+        """
+        selected_id, _ = self.get_selected_item()
+        self._apply_sort(self._resolve_sort_keys(sort_mode, sort_keys), background, select_id=selected_id)
+
+    def _resolve_sort_keys(self, sort_mode, sort_keys):
+        if sort_keys:
+            return normalize_sort_keys(sort_keys)
+        if sort_mode in (WSSortOrder.ASCENDING, WSSortOrder.DESCENDING):
+            return [WSSortKey(self._display_index, sort_mode)]
+        return []  # leave unsorted
+
+    def _apply_sort(self, sort_keys, background=None, select_id=None):
+        self._sort_generation += 1
+        if not sort_keys:
+            self._fill_rows(select_id)
+            self.sort_finished.emit()
+            return
+
+        if background is None:
+            threshold = self.background_sort_threshold
+            background = threshold is not None and len(self._rows) >= threshold
+
+        if not background:
+            self._rows, new_keys = self._key_cache.sort_rows(self._rows, sort_keys)
+            self._key_cache.update(new_keys)
+            self._fill_rows(select_id)
+            self.sort_finished.emit()
+            return
+
+        generation = self._sort_generation
+        rows = list(self._rows)
+        cache = self._key_cache
+
+        def sort_job(progress_callback=None):
+            # QCollator is not thread-safe, so the worker uses its own
+            return cache.sort_rows(rows, sort_keys, collator=cache.new_collator())
+
+        def on_finish(result):
+            sorted_rows, new_keys = result
+            cache.update(new_keys)
+            if generation != self._sort_generation:
+                return  # Superseded by a newer sort or clear
+            # Keep rows added with add_items() while the sort was running
+            self._rows = sorted_rows + self._rows[len(rows):]
+            self._fill_rows(select_id)
+            self.sort_finished.emit()
+
+        def on_error(err):
+            exception, tb = err
+            logger.error(f"Background sort failed: {exception}\n{tb}")
+            if generation != self._sort_generation:
+                return
+            # Show the rows unsorted rather than leaving the list empty
+            self._fill_rows(select_id)
+            self.sort_finished.emit()
+
+        run_in_thread(sort_job, on_finish=on_finish, on_error=on_error, parent=self)
+
+    def _make_row(self, item_id, display_text):
+        row = [None] * (max(self._id_index, self._display_index) + 1)
+        row[self._id_index] = item_id
+        row[self._display_index] = display_text
+        return tuple(row)
+
+    def _fill_rows(self, select_id=None):
+        """Rebuilds the Qt items from self._rows and restores the selection."""
+        display_index = self._display_index
+        id_index = self._id_index
+        row_by_id = self._row_by_id = {}
+
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
+        try:
+            super().clear()  # Keep self._rows
+            self._visible_ids = None
+            self._visible_rows = None
+            for row_number, row in enumerate(self._rows):
+                display_text = row[display_index] if len(row) > display_index else 'Unknown'
                 list_widget_item = QListWidgetItem(display_text)
-                list_widget_item.setData(Qt.ItemDataRole.UserRole, item_id)  # ✅ Storing doc_id
+                list_widget_item.setData(Qt.ItemDataRole.UserRole, row[id_index])  # ✅ Storing doc_id
                 self.addItem(list_widget_item)
-
-        if self.count() > 0:
-            self.setCurrentRow(0)
+                row_by_id[row[id_index]] = row_number
+        finally:
+            self.blockSignals(False)
+            self.setUpdatesEnabled(True)
+
+        if self._filter_text:
+            self._apply_filter(keep_current=False)
+
+        if select_id is not None and self.select_by_id(select_id):
+            return
+        self.go_to_first_line()
+
+    # Filtering
+    def set_filter(self, text, immediate=False):
+        """
+        Narrows the visible rows to those whose text contains `text` (case-insensitive).
+
+        Calls are debounced by `filter_debounce_ms`, so this can be connected straight to a line edit's
+        `textChanged` signal. Pass `immediate=True` to filter synchronously. `filter_applied` is emitted
+        with the number of visible rows once the filter has been applied.
+        """
+        self._filter_text = text or ''
+        if immediate:
+            self._filter_timer.stop()
+            self._apply_filter()
+        else:
+            self._filter_timer.start()
+
+    def clear_filter(self):
+        """Removes the filter and shows all rows."""
+        self.set_filter('', immediate=True)
+
+    def cancel_filter(self):
+        """Drops a pending (debounced) filter update and keeps the currently applied one."""
+        self._filter_timer.stop()
+
+    def get_filter_text(self):
+        return self._filter_text
+
+    @property
+    def filter_debounce_ms(self):
+        return self._filter_timer.interval()
+
+    @filter_debounce_ms.setter
+    def filter_debounce_ms(self, value):
+        self._filter_timer.setInterval(value)
+
+    def _get_filter_index(self):
+        if self._filter_index is None:
+            display_index = self._display_index
+            id_index = self._id_index
+            self._filter_index = WSNgramIndex()
+            self._filter_index.add_many(
+                (row[id_index], row[display_index] if len(row) > display_index else 'Unknown') for row in self._rows)
+        return self._filter_index
+
+    def _apply_filter(self, keep_current=True):
+        text = self._filter_text
+        row_by_id = self._row_by_id
+
+        if not text:
+            if self._visible_ids is None:
+                return
+            hidden = set(row_by_id) - self._visible_ids
+            self._visible_ids = None
+            self._visible_rows = None
+            self.setUpdatesEnabled(False)
+            try:
+                for item_id in hidden:
+                    self.setRowHidden(row_by_id[item_id], False)
+            finally:
+                self.setUpdatesEnabled(True)
+            self.filter_applied.emit(self.count())
+            return
+
+        # While typing, each query usually extends the previous one, so its result narrows the search
+        previous = self._visible_ids
+        previous_text = self._applied_filter_text if previous is not None else ''
+        candidates = previous if previous_text and previous_text.casefold() in text.casefold() else None
+        visible = self._get_filter_index().search(text, candidates)
+
+        shown = previous if previous is not None else set(row_by_id)
+        self.setUpdatesEnabled(False)
+        try:
+            for item_id in shown - visible:
+                self.setRowHidden(row_by_id[item_id], True)
+            for item_id in visible - shown:
+                self.setRowHidden(row_by_id[item_id], False)
+            # Hidden rows must not stay selected, or selected_ids() and `selected` would report rows the user
+            # cannot see
+            selection_model = self.selectionModel()
+            hidden_selected = sorted(index.row() for index in selection_model.selectedRows()
+                                     if self.isRowHidden(index.row()))
+            if hidden_selected:
+                selection_model.select(self._rows_to_selection(hidden_selected),
+                                       QItemSelectionModel.SelectionFlag.Deselect)
+        finally:
+            self.setUpdatesEnabled(True)
+
+        self._visible_ids = visible
+        self._visible_rows = sorted(row_by_id[item_id] for item_id in visible)
+        self._applied_filter_text = text
+
+        if keep_current and (self.currentRow() < 0 or self.isRowHidden(self.currentRow())):
+            if self._visible_rows:
+                self.go_to_first_line()
+            else:
+                self.clearSelection()
+                self.setCurrentItem(None)
+
+        self.filter_applied.emit(len(visible))
+
+    def set_selection_coalescing(self, enabled, debounce_ms=None):
+        """
+        Enables or disables selection signal coalescing.
+
+        While enabled, bursts of selection changes (range selection, programmatic selection,
+        select_by_id) emit `selection_changed` and `selected` once, after `debounce_ms` milliseconds
+        without further changes, or on the next event-loop turn when `debounce_ms` is 0.
+        Disabling it delivers any pending emission immediately.
+        """
+        if debounce_ms is not None:
+            self._selection_timer.setInterval(debounce_ms)
+        self.coalesce_selection = enabled
+        if not enabled:
+            self.flush_selection()
+
+    def flush_selection(self):
+        """Delivers a pending coalesced selection emission right away."""
+        if self._selection_timer.isActive():
+            self._selection_timer.stop()
+            self.get_data_to_emit()
+
+    def reset_selection_emit_count(self):
+        self.selection_emit_count = 0
+
+    def _on_item_selection_changed(self):
+        if self.coalesce_selection:
+            self._selection_timer.start()  # Restarting an active timer collapses the burst
+        else:
+            self.get_data_to_emit()
 
     def get_data_to_emit(self):
         """Emit signals for selected item."""
+        self._selection_timer.stop()
+        self.selection_emit_count += 1
         self.selection_changed.emit()
         selected_items = self.selectedItems()
         if selected_items:
@@ -93,8 +406,12 @@ class WSListSelectionWidget(QListWidget):
         return None, None
 
     def get_all_selected_items(self):
-        """Retrieve data for all selected items (multi-select)."""
-        return [(item.data(Qt.ItemDataRole.UserRole), item.text()) for item in self.selectedItems()]
+        """Retrieve data for all selected items (multi-select), in row order."""
+        return [(self._id_at(row), self._text_at(row)) for row in self._selected_rows()]
+
+    def selected_ids(self):
+        """Return the IDs of all selected items in row order, read from the selection ranges."""
+        return [self._id_at(row) for row in self._selected_rows()]
 
     # def handle_double_click(self, item):
     #     """Handle double-click event."""
@@ -118,22 +435,143 @@ class WSListSelectionWidget(QListWidget):
         item_id = item.data(Qt.ItemDataRole.UserRole)
         item_name = item.text()
 
-        menu = QMenu(self)
-        for action_name, action_function in self.actions.items():
-            action = menu.addAction(action_name)
-            action.triggered.connect(lambda _, fn=action_function, id=item_id, name=item_name: fn(id, name))
+        menu = self._get_context_menu()
+        self._context_target = (item_id, item_name)
+
+        predicates = self.action_predicates
+        for action_name, action in self._context_actions.items():
+            predicate = predicates.get(action_name)
+            action.setEnabled(predicate is None or bool(predicate(item_id, item_name)))
 
         menu.exec(self.viewport().mapToGlobal(position))
 
+    def invalidate_context_menu(self):
+        """Forces the context menu to be rebuilt on the next right-click."""
+        if self._context_menu is not None:
+            self._context_menu.deleteLater()
+        self._context_menu = None
+        self._context_actions = {}
+
+    def _get_context_menu(self):
+        # Catch in-place edits of the actions dict as well as reassignment
+        if self._context_menu is None or self._actions != self._context_snapshot:
+            self.invalidate_context_menu()
+            menu = QMenu(self)
+            for action_name in self._actions:
+                action = menu.addAction(action_name)
+                action.setData(action_name)
+                self._context_actions[action_name] = action
+            menu.triggered.connect(self._on_context_action_triggered)
+            self._context_menu = menu
+            self._context_snapshot = dict(self._actions)
+        return self._context_menu
+
+    def _on_context_action_triggered(self, action):
+        action_function = self._actions.get(action.data())
+        if action_function is not None:
+            action_function(*self._context_target)
+
     def select_by_id(self, record_id):
-        """Select an item by ID."""
-        for index in range(self.count()):
-            item = self.item(index)
-            if item.data(Qt.ItemDataRole.UserRole) == record_id:
-                self.setCurrentRow(index)
-                self.get_data_to_emit()
-                return True
-        return False
+        """Select an item by ID. Items hidden by the filter are not selected."""
+        index = self._row_by_id.get(record_id)
+        if index is None or self.isRowHidden(index):
+            return False
+        self.setCurrentRow(index)
+        self._on_item_selection_changed()
+        return True
+
+    # Bulk selection (each call applies a single QItemSelection, so selection signals fire once)
+    def select_ids(self, ids, clear=True):
+        """
+        Select all items whose ID is in `ids`. Unknown IDs and rows hidden by the filter are skipped.
+
+        In single-selection mode only the first matching row (in row order) is selected.
+
+        Returns:
+            int: The number of selected rows.
+        """
+        row_by_id = self._row_by_id
+        rows = sorted({row_by_id[item_id] for item_id in ids if item_id in row_by_id})
+        if self._visible_rows is not None:
+            rows = [row for row in rows if not self.isRowHidden(row)]
+        if self.selectionMode() == QAbstractItemView.SelectionMode.SingleSelection:
+            rows = rows[:1]
+        self._apply_selection(rows, clear)
+        return len(rows)
+
+    def select_range(self, first_row, last_row, clear=True):
+        """
+        Select the visible rows from `first_row` to `last_row` inclusive.
+
+        In single-selection mode only the first of those rows is selected.
+        """
+        first_row = max(first_row, 0)
+        last_row = min(last_row, self.count() - 1)
+        if self._visible_rows is not None:
+            visible = self._visible_rows
+            rows = visible[bisect_left(visible, first_row):bisect_right(visible, last_row)]
+        else:
+            rows = range(first_row, last_row + 1)
+        if self.selectionMode() == QAbstractItemView.SelectionMode.SingleSelection:
+            rows = rows[:1]
+        self._apply_selection(rows, clear)
+
+    def invert_selection(self):
+        """Toggle the selection state of every visible row. Does nothing in single-selection mode."""
+        if self.selectionMode() == QAbstractItemView.SelectionMode.SingleSelection:
+            return
+        rows = self._visible_rows if self._visible_rows is not None else range(self.count())
+        selection = self._rows_to_selection(rows)
+        if not selection.isEmpty():
+            self.selectionModel().select(selection, QItemSelectionModel.SelectionFlag.Toggle)
+
+    def _apply_selection(self, rows, clear=True):
+        selection = self._rows_to_selection(rows)
+        flags = (QItemSelectionModel.SelectionFlag.ClearAndSelect if clear
+                 else QItemSelectionModel.SelectionFlag.Select)
+        if selection.isEmpty():
+            if clear:
+                self.clearSelection()
+            return
+        self.selectionModel().select(selection, flags)
+        self.selectionModel().setCurrentIndex(selection.first().topLeft(),
+                                              QItemSelectionModel.SelectionFlag.NoUpdate)
+
+    def _rows_to_selection(self, rows):
+        """Build a QItemSelection from ascending row numbers, merging consecutive rows into one range."""
+        model = self.model()
+        selection = QItemSelection()
+        start = previous = None
+        for row in rows:
+            if start is None:
+                start = previous = row
+            elif row == previous + 1:
+                previous = row
+            else:
+                selection.select(model.index(start, 0), model.index(previous, 0))
+                start = previous = row
+        if start is not None:
+            selection.select(model.index(start, 0), model.index(previous, 0))
+        return selection
+
+    def _selected_rows(self):
+        rows = []
+        for selection_range in self.selectionModel().selection():
+            rows.extend(range(selection_range.top(), selection_range.bottom() + 1))
+        rows.sort()
+        return rows
+
+    def _id_at(self, row):
+        # self._rows mirrors the Qt items unless items were added through the plain QListWidget API
+        if len(self._rows) == self.count():
+            return self._rows[row][self._id_index]
+        return self.item(row).data(Qt.ItemDataRole.UserRole)
+
+    def _text_at(self, row):
+        if len(self._rows) == self.count():
+            values = self._rows[row]
+            return values[self._display_index] if len(values) > self._display_index else 'Unknown'
+        return self.item(row).text()
 
     def get_all_ids(self):
         """Retrieve all item IDs in the list."""
@@ -143,31 +581,53 @@ class WSListSelectionWidget(QListWidget):
         """Retrieve all IDs and text values."""
         return [(self.item(i).data(Qt.ItemDataRole.UserRole), self.item(i).text()) for i in range(self.count())]
 
-    # Navigation Methods
+    # Navigation Methods (these move over the visible rows only while a filter is applied)
     def go_to_first_line(self):
-        if self.count() > 0:
+        visible = self._visible_rows
+        if visible is not None:
+            if visible:
+                self.setCurrentRow(visible[0])
+        elif self.count() > 0:
             self.setCurrentRow(0)
 
     def go_to_last_line(self):
-        if self.count() > 0:
+        visible = self._visible_rows
+        if visible is not None:
+            if visible:
+                self.setCurrentRow(visible[-1])
+        elif self.count() > 0:
             self.setCurrentRow(self.count() - 1)
 
     def go_to_next_line(self):
-        if self.currentRow() < self.count() - 1:
+        visible = self._visible_rows
+        if visible is not None:
+            position = bisect_right(visible, self.currentRow())
+            if position < len(visible):
+                self.setCurrentRow(visible[position])
+        elif self.currentRow() < self.count() - 1:
             self.setCurrentRow(self.currentRow() + 1)
 
     def go_to_previous_line(self):
-        if self.currentRow() > 0:
+        visible = self._visible_rows
+        if visible is not None:
+            position = bisect_left(visible, self.currentRow())
+            if position > 0:
+                self.setCurrentRow(visible[position - 1])
+        elif self.currentRow() > 0:
             self.setCurrentRow(self.currentRow() - 1)
 
     def get_current_row_number(self):
         # return self.currentRow() + 1 if self.currentRow() >= 0 else 0
+        visible = self._visible_rows
+        if visible is not None:
+            position = bisect_left(visible, self.currentRow())
+            return position + 1 if position < len(visible) and visible[position] == self.currentRow() else 0
         return max(self.currentRow() + 1, 0)
 
     def get_total_rows(self):
-        return self.count()
+        return len(self._visible_rows) if self._visible_rows is not None else self.count()
 
     def get_selected_count(self):
         """Return the number of selected rows."""
-        return len(self.selectedItems())
+        return sum(selection_range.height() for selection_range in self.selectionModel().selection())
 
@@ -1,6 +1,6 @@
 # ws_core.py
 
-from enum import Enum
+from enum import Enum, IntEnum
 from dataclasses import dataclass
 
 import logging
@@ -17,6 +17,22 @@ class WSSortOrder(Enum):
         return "Ascending (A → Z)" if self is WSSortOrder.ASCENDING else "Descending (Z → A)"
 
 
+@dataclass(frozen=True)
+class WSSortKey:
+    """One level of a multi-key sort: the row column to sort on and its direction."""
+    column: int
+    order: WSSortOrder = WSSortOrder.ASCENDING
+
+
+class WSTaskPriority(IntEnum):
+    """Priorities for run_in_thread; QThreadPool starts queued tasks with a higher value first."""
+    BACKGROUND = -20
+    LOW = -10
+    NORMAL = 0
+    HIGH = 10
+    INTERACTIVE = 20
+
+
 class WSActions(Enum):
     SAVE = "save"
     OPEN = "open"